@@ -109,7 +109,7 @@ class LocalAPIClient:
                 "confidence": 1.0,
                 "details": {"track_id": event.track_id},
             }
-            response = await client.post("/inventory/event", json=payload)
+            response = await client.post("/inventory/event/queued", json=payload)
             response.raise_for_status()
             return True
         except Exception as e:
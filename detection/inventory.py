@@ -1,11 +1,13 @@
 """Inventory state management and delta generation."""
 
 import logging
-from collections import defaultdict
+from collections import Counter
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from .models import TrackedDetection
 
@@ -73,6 +75,11 @@ class InventoryStateManager:
 
     Tracks individual items via their track IDs and generates
     SNACK_TAKEN/SNACK_ADDED events when items appear or disappear.
+
+    Per-track state is kept as parallel arrays (track IDs, class names,
+    frames missing) indexed through ``active_tracks``, so the per-frame
+    debounce is one vectorized increment and compare rather than a dict
+    walk over every track.
     """
 
     def __init__(
@@ -90,12 +97,14 @@ class InventoryStateManager:
         self.debounce_frames = debounce_frames
 
         # Current state
-        self.current_counts: Dict[str, int] = defaultdict(int)
-        self.active_tracks: Dict[int, str] = {}  # track_id -> class_name
+        self.current_counts: Counter[str] = Counter()
+        self.active_tracks: Dict[int, int] = {}  # track_id -> array index
         self.pending_events: List[InventoryEvent] = []
 
-        # Disappearance tracking for debouncing
-        self.disappeared_tracks: Dict[int, int] = {}  # track_id -> frames_missing
+        # Parallel per-track arrays, in the order tracks were first seen
+        self._track_ids = np.empty(0, dtype=np.int64)
+        self._class_names: List[str] = []
+        self._missed_frames = np.empty(0, dtype=np.int32)
 
     def update(self, detections: List[TrackedDetection]) -> List[InventoryEvent]:
         """Update inventory state with new detections.
@@ -107,15 +116,15 @@ class InventoryStateManager:
             List of new inventory events generated
         """
         events: List[InventoryEvent] = []
-        current_track_ids: Set[int] = set()
+        seen: List[int] = []
 
         # Process current detections
         for det in detections:
-            current_track_ids.add(det.track_id)
+            index = self.active_tracks.get(det.track_id)
 
-            # Check for new tracks (item added)
-            if det.track_id not in self.active_tracks:
-                self.active_tracks[det.track_id] = det.class_name
+            # New track (item added)
+            if index is None:
+                index = self._add_track(det.track_id, det.class_name)
                 count_before = self.current_counts[det.class_name]
                 self.current_counts[det.class_name] += 1
 
@@ -133,45 +142,67 @@ class InventoryStateManager:
                     f"count: {count_before} -> {self.current_counts[det.class_name]})"
                 )
 
-            # Track reappeared - reset disappearance counter
-            if det.track_id in self.disappeared_tracks:
-                del self.disappeared_tracks[det.track_id]
+            seen.append(index)
 
-        # Check for disappeared tracks (item taken)
-        for track_id, class_name in list(self.active_tracks.items()):
-            if track_id not in current_track_ids:
-                # Increment disappearance counter
-                self.disappeared_tracks[track_id] = (
-                    self.disappeared_tracks.get(track_id, 0) + 1
-                )
+        # Every track ages a frame; tracks seen this frame (including
+        # reappearances) start over
+        self._missed_frames += 1
+        self._missed_frames[seen] = 0
 
-                # Check if debounce threshold reached
-                if self.disappeared_tracks[track_id] >= self.debounce_frames:
-                    count_before = self.current_counts[class_name]
-                    self.current_counts[class_name] = max(0, count_before - 1)
-
-                    event = InventoryEvent(
-                        type=EventType.SNACK_TAKEN,
-                        item=class_name,
-                        timestamp=datetime.utcnow(),
-                        track_id=track_id,
-                        count_before=count_before,
-                        count_after=self.current_counts[class_name],
-                    )
-                    events.append(event)
-                    logger.info(
-                        f"SNACK_TAKEN: {class_name} (track_id={track_id}, "
-                        f"count: {count_before} -> {self.current_counts[class_name]})"
-                    )
-
-                    # Clean up
-                    del self.active_tracks[track_id]
-                    del self.disappeared_tracks[track_id]
+        # Tracks missing for the debounce threshold (item taken)
+        expired = np.flatnonzero(
+            self._missed_frames >= max(self.debounce_frames, 1)
+        )
+        for index in expired:
+            track_id = int(self._track_ids[index])
+            class_name = self._class_names[index]
+            count_before = self.current_counts[class_name]
+            self.current_counts[class_name] = max(0, count_before - 1)
+
+            event = InventoryEvent(
+                type=EventType.SNACK_TAKEN,
+                item=class_name,
+                timestamp=datetime.utcnow(),
+                track_id=track_id,
+                count_before=count_before,
+                count_after=self.current_counts[class_name],
+            )
+            events.append(event)
+            logger.info(
+                f"SNACK_TAKEN: {class_name} (track_id={track_id}, "
+                f"count: {count_before} -> {self.current_counts[class_name]})"
+            )
+
+        if expired.size:
+            self._remove_tracks(expired)
 
         # Accumulate events for batching
         self.pending_events.extend(events)
         return events
 
+    def _add_track(self, track_id: int, class_name: str) -> int:
+        """Append a track to the per-track arrays and return its index."""
+        index = len(self._class_names)
+        self._track_ids = np.append(self._track_ids, track_id)
+        self._class_names.append(class_name)
+        self._missed_frames = np.append(self._missed_frames, np.int32(0))
+        self.active_tracks[track_id] = index
+        return index
+
+    def _remove_tracks(self, indices: np.ndarray) -> None:
+        """Drop tracks from the per-track arrays and reindex the rest."""
+        keep = np.ones(len(self._class_names), dtype=bool)
+        keep[indices] = False
+
+        self._track_ids = self._track_ids[keep]
+        self._missed_frames = self._missed_frames[keep]
+        self._class_names = [
+            name for name, kept in zip(self._class_names, keep) if kept
+        ]
+        self.active_tracks = {
+            int(track_id): index for index, track_id in enumerate(self._track_ids)
+        }
+
     def get_delta(self) -> Optional[InventoryDelta]:
         """Get pending inventory delta for API push.
 
@@ -200,4 +231,6 @@ class InventoryStateManager:
         self.current_counts.clear()
         self.active_tracks.clear()
         self.pending_events.clear()
-        self.disappeared_tracks.clear()
+        self._track_ids = np.empty(0, dtype=np.int64)
+        self._class_names = []
+        self._missed_frames = np.empty(0, dtype=np.int32)
@@ -1,7 +1,7 @@
 """Motion detection for CPU efficiency."""
 
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -16,11 +16,15 @@ class MotionDetector:
     only when there's activity in the frame.
     """
 
+    # Per-pixel intensity change (0-255) that counts as "changed"
+    PIXEL_DIFF_THRESHOLD = 25
+
     def __init__(
         self,
         threshold: float = 0.008,
         blur_size: int = 11,
         cooldown_frames: int = 45,
+        downsample: int = 2,
     ):
         """Initialize motion detector.
 
@@ -31,13 +35,30 @@ class MotionDetector:
                       11 = less smoothing, better small change detection
             cooldown_frames: Frames to continue detection after motion stops.
                             45 = ~1.5 seconds at 30fps to catch item settling
+            downsample: Number of pyrDown halvings before differencing.
+                       2 = 640x480 compared at 160x120 (16x fewer pixels)
         """
         self.threshold = threshold
         self.blur_size = blur_size
         self.cooldown_frames = cooldown_frames
+        self.downsample = downsample
+        # Scale the kernel with the image so smoothing covers the same area
+        kernel = max(3, (blur_size >> downsample) | 1)
+        self._blur_kernel = (kernel, kernel)
         self.prev_frame: Optional[np.ndarray] = None
         self.motion_cooldown: int = 0
         self.last_motion_score: float = 0.0
+        # Per-stage output buffers, reused so steady-state frames allocate nothing
+        self._buffers: Dict[str, np.ndarray] = {}
+        # threshold as a changed-pixel count, keyed by (pixels, threshold)
+        self._threshold_px: Tuple[Tuple[int, float], int] = ((0, 0.0), 0)
+
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Return the reusable uint8 buffer for a stage, sized to shape."""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = self._buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buf
 
     def detect(self, frame: np.ndarray) -> bool:
         """Check if motion is detected in frame.
@@ -48,23 +69,42 @@ class MotionDetector:
         Returns:
             True if motion detected or in cooldown period
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (self.blur_size, self.blur_size), 0)
+        # Convert to grayscale, shrink, then blur the small image
+        gray = cv2.cvtColor(
+            frame, cv2.COLOR_BGR2GRAY, dst=self._buffer("gray", frame.shape[:2])
+        )
+        for level in range(self.downsample):
+            height, width = gray.shape
+            gray = cv2.pyrDown(
+                gray,
+                dst=self._buffer(f"pyr{level}", ((height + 1) // 2, (width + 1) // 2)),
+            )
+        blurred = cv2.GaussianBlur(
+            gray, self._blur_kernel, 0, dst=self._buffer("blurred", gray.shape)
+        )
 
         # First frame - always run detection
         if self.prev_frame is None:
-            self.prev_frame = gray
+            # Keep it: the next frame blurs into a fresh buffer
+            self.prev_frame = self._buffers.pop("blurred")
             return True
 
-        # Calculate frame difference
-        diff = cv2.absdiff(self.prev_frame, gray)
-        self.last_motion_score = np.mean(diff) / 255.0
-
-        self.prev_frame = gray
-
-        # Check if motion exceeds threshold
-        if self.last_motion_score > self.threshold:
+        # Fraction of pixels whose intensity changed noticeably
+        changed = cv2.absdiff(
+            self.prev_frame, blurred, dst=self._buffer("diff", blurred.shape)
+        )
+        cv2.threshold(
+            changed, self.PIXEL_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=changed
+        )
+        changed_px = cv2.countNonZero(changed)
+        self.last_motion_score = changed_px / changed.size
+
+        # The old previous frame becomes the next frame's blur buffer
+        self._buffers["blurred"], self.prev_frame = self.prev_frame, blurred
+
+        # Check if motion exceeds threshold (as a pixel count, so the
+        # comparison stays integer)
+        if changed_px > self._threshold_pixels(changed.size):
             self.motion_cooldown = self.cooldown_frames
             return True
 
@@ -75,6 +115,17 @@ class MotionDetector:
 
         return False
 
+    def _threshold_pixels(self, pixels: int) -> int:
+        """Return the changed-pixel count that threshold corresponds to.
+
+        count > int(threshold * pixels) is the same test as
+        count / pixels > threshold for an integer count.
+        """
+        key = (pixels, self.threshold)
+        if self._threshold_px[0] != key:
+            self._threshold_px = (key, int(self.threshold * pixels))
+        return self._threshold_px[1]
+
     def reset(self) -> None:
         """Reset the motion detector state."""
         self.prev_frame = None
@@ -14,17 +14,29 @@ class PrivacyPipeline:
 
     Blurs areas outside the configured ROI to protect privacy
     while still showing the snack shelf area clearly.
+
+    The blur is cv2.stackBlur, a Gaussian approximation whose cost per
+    pixel does not grow with the kernel size. It is not an exact
+    Gaussian, but at privacy kernel sizes the difference is not visible.
     """
 
     def __init__(self, blur_intensity: int = 51):
         """Initialize privacy pipeline.
 
         Args:
-            blur_intensity: Gaussian blur kernel size (must be odd)
+            blur_intensity: Blur kernel size (must be odd)
         """
         # Ensure blur intensity is odd
         self.blur_intensity = blur_intensity if blur_intensity % 2 == 1 else blur_intensity + 1
         self.roi: Optional[Dict[str, int]] = None
+        self._roi_xyxy: Optional[Tuple[int, int, int, int]] = None
+        # Clamped ROI for the last frame size seen: ((height, width), coords)
+        self._roi_coords: Optional[Tuple[Tuple[int, int], Tuple[int, int, int, int]]] = None
+        # Two reused output frames, alternated so the previously returned
+        # frame stays intact while the next one is written
+        self._display_buffers: List[np.ndarray] = []
+        self._next_buffer = 0
+        self._blur_scratch = np.empty(0, dtype=np.uint8)
 
     def set_roi(self, roi: Optional[Dict[str, int]]) -> None:
         """Set the Region of Interest.
@@ -33,16 +45,27 @@ class PrivacyPipeline:
             roi: Dictionary with x1, y1, x2, y2 keys, or None for full frame
         """
         self.roi = roi
+        self._roi_xyxy = (roi["x1"], roi["y1"], roi["x2"], roi["y2"]) if roi else None
+        self._roi_coords = None
         if roi:
             logger.info(f"ROI set to: ({roi['x1']}, {roi['y1']}) -> ({roi['x2']}, {roi['y2']})")
         else:
             logger.info("ROI cleared - using full frame")
 
-    def process_for_display(self, frame: np.ndarray) -> np.ndarray:
+    def process_for_display(
+        self,
+        frame: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
         """Apply blur outside ROI for admin display.
 
+        With no ROI the frame itself is returned, uncopied. Otherwise,
+        without ``out`` the result is written into one of two internal
+        buffers, so it stays valid until the call after next.
+
         Args:
             frame: BGR image as numpy array
+            out: Optional buffer with the frame's shape and dtype to write into
 
         Returns:
             Processed frame with blur outside ROI
@@ -51,22 +74,70 @@ class PrivacyPipeline:
             return frame
 
         x1, y1, x2, y2 = self._get_roi_coords(frame.shape)
-
-        # Blur entire frame
-        blurred = cv2.GaussianBlur(
-            frame,
-            (self.blur_intensity, self.blur_intensity),
-            0
-        )
+        if out is None:
+            out = self._display_buffer(frame)
+
+        height, width = frame.shape[:2]
+        if x1 == 0 and x2 == width:
+            # Full-width ROI (e.g. a shelf band): blur only the bands above
+            # and below it. Narrow side strips are not split out because
+            # blurring them costs more than one whole-frame pass.
+            if y1 > 0:
+                self._blur_region(frame, out, 0, y1)
+            if y2 < height:
+                self._blur_region(frame, out, y2, height)
+        else:
+            cv2.stackBlur(frame, (self.blur_intensity, self.blur_intensity), dst=out)
 
         # Restore ROI region
-        result = blurred.copy()
-        result[y1:y2, x1:x2] = frame[y1:y2, x1:x2]
+        out[y1:y2, x1:x2] = frame[y1:y2, x1:x2]
 
         # Draw ROI border
-        cv2.rectangle(result, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.rectangle(out, (x1, y1), (x2, y2), (0, 255, 0), 2)
+
+        return out
 
-        return result
+    def _blur_region(
+        self,
+        frame: np.ndarray,
+        out: np.ndarray,
+        top: int,
+        bottom: int,
+    ) -> None:
+        """Write the blur of rows [top, bottom) of frame into out.
+
+        The band is blurred with a kernel size of rows of context, so the
+        result matches blurring the whole frame. A radius would suffice
+        for the filter itself, but stackBlur treats borders differently
+        on images shorter than the kernel.
+        """
+        context = self.blur_intensity
+        src_top = max(0, top - context)
+        src = frame[src_top : min(frame.shape[0], bottom + context)]
+
+        # Contiguous view over a reused flat buffer
+        if self._blur_scratch.size < src.size or self._blur_scratch.dtype != src.dtype:
+            self._blur_scratch = np.empty(frame.size, dtype=frame.dtype)
+        scratch = self._blur_scratch[: src.size].reshape(src.shape)
+
+        blurred = cv2.stackBlur(
+            src, (self.blur_intensity, self.blur_intensity), dst=scratch
+        )
+        out[top:bottom] = blurred[top - src_top : bottom - src_top]
+
+    def _display_buffer(self, frame: np.ndarray) -> np.ndarray:
+        """Return the next reusable output buffer for frames like this one."""
+        buffers = self._display_buffers
+        if (
+            not buffers
+            or buffers[0].shape != frame.shape
+            or buffers[0].dtype != frame.dtype
+        ):
+            buffers[:] = [np.empty_like(frame), np.empty_like(frame)]
+            self._next_buffer = 0
+        out = buffers[self._next_buffer]
+        self._next_buffer ^= 1
+        return out
 
     def crop_for_detection(self, frame: np.ndarray) -> np.ndarray:
         """Crop frame to ROI for detection processing.
@@ -101,6 +172,9 @@ class PrivacyPipeline:
             return detections
 
         x1, y1, _, _ = self._get_roi_coords(frame_shape)
+        if x1 == 0 and y1 == 0:
+            # ROI starts at the frame origin; nothing to shift
+            return detections
 
         for det in detections:
             if hasattr(det, 'bbox') and len(det.bbox) >= 4:
@@ -117,27 +191,35 @@ class PrivacyPipeline:
     ) -> Tuple[int, int, int, int]:
         """Get ROI coordinates, clamped to frame bounds.
 
+        The clamped coordinates are cached until the ROI or the frame
+        size changes, so steady-state frames skip the clamping.
+
         Args:
             frame_shape: Frame shape (height, width, ...)
 
         Returns:
             Tuple of (x1, y1, x2, y2)
         """
-        height, width = frame_shape[:2]
-
-        x1 = max(0, min(self.roi["x1"], width - 1))
-        y1 = max(0, min(self.roi["y1"], height - 1))
-        x2 = max(x1 + 1, min(self.roi["x2"], width))
-        y2 = max(y1 + 1, min(self.roi["y2"], height))
-
+        size = frame_shape[:2]
+        if self._roi_coords is not None and self._roi_coords[0] == size:
+            return self._roi_coords[1]
+
+        height, width = size
+        roi_x1, roi_y1, roi_x2, roi_y2 = self._roi_xyxy
+        x1 = max(0, min(roi_x1, width - 1))
+        y1 = max(0, min(roi_y1, height - 1))
+        x2 = max(x1 + 1, min(roi_x2, width))
+        y2 = max(y1 + 1, min(roi_y2, height))
+
+        self._roi_coords = (size, (x1, y1, x2, y2))
         return x1, y1, x2, y2
 
     @property
     def roi_offset(self) -> Tuple[int, int]:
         """Get ROI offset for coordinate adjustment."""
-        if self.roi is None:
+        if self._roi_xyxy is None:
             return (0, 0)
-        return (self.roi["x1"], self.roi["y1"])
+        return self._roi_xyxy[:2]
 
     @property
     def has_roi(self) -> bool:
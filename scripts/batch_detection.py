@@ -13,6 +13,7 @@ import argparse
 import csv
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 
 import cv2
@@ -20,17 +21,27 @@ import numpy as np
 from ultralytics import YOLO
 
 
+@lru_cache(maxsize=512)
+def _text_size(label: str, font_scale: float, thickness: int):
+    """Measure a label once; labels repeat heavily across boxes and frames."""
+    return cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
+
 def draw_detections(
     image: np.ndarray,
     results,
     font_scale: float = 0.6,
     thickness: int = 2,
 ) -> np.ndarray:
-    """Draw bounding boxes and labels on image."""
-    annotated = image.copy()
+    """Draw bounding boxes and labels on image.
 
+    With no detections the input image is returned as-is, skipping the
+    full-frame copy.
+    """
     if results.boxes is None or len(results.boxes) == 0:
-        return annotated
+        return image
+
+    annotated = image.copy()
 
     colors = {}
 
@@ -48,9 +59,7 @@ def draw_detections(
         cv2.rectangle(annotated, (x1, y1), (x2, y2), color, thickness)
 
         label = f"{class_name}: {confidence:.2f}"
-        (label_w, label_h), baseline = cv2.getTextSize(
-            label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
-        )
+        (label_w, label_h), baseline = _text_size(label, font_scale, thickness)
 
         cv2.rectangle(
             annotated,
@@ -20,8 +20,10 @@ Usage:
 import argparse
 import random
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 
@@ -90,6 +92,53 @@ def convert_to_yolo_format(
     return x_center, y_center, width, height
 
 
+def convert_to_yolo_format_batch(
+    bboxes: np.ndarray,
+    sizes: np.ndarray,
+) -> np.ndarray:
+    """Vectorized convert_to_yolo_format over many boxes at once.
+
+    Args:
+        bboxes: (N, 4) array of (x1, y1, x2, y2) absolute pixel coordinates
+        sizes: (N, 2) array of (width, height) image sizes in pixels
+
+    Returns:
+        (N, 4) array of (x_center, y_center, width, height) normalized to 0-1
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+
+    # Clamp coordinates to image bounds
+    clamped = np.clip(bboxes, 0.0, np.tile(sizes, 2))
+    x1, y1, x2, y2 = clamped.T
+    img_width, img_height = sizes.T
+
+    return np.stack(
+        [
+            (x1 + x2) / 2.0 / img_width,
+            (y1 + y2) / 2.0 / img_height,
+            (x2 - x1) / img_width,
+            (y2 - y1) / img_height,
+        ],
+        axis=1,
+    )
+
+
+def copy_and_measure(src: Path, dst: Path) -> tuple[int, int]:
+    """Copy an image and return its (width, height) using a single open.
+
+    PIL only parses the header to report the size, so the same file
+    handle is rewound and streamed to the destination.
+    """
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        with Image.open(fin) as img:
+            size = img.size
+        fin.seek(0)
+        shutil.copyfileobj(fin, fout, 1 << 20)
+    shutil.copystat(src, dst)
+    return size
+
+
 def convert_dataset(
     input_dir: Path,
     output_dir: Path,
@@ -97,6 +146,7 @@ def convert_dataset(
     val_ratio: float = 0.1,
     test_ratio: float = 0.1,
     seed: int = 42,
+    workers: int = 32,
 ) -> None:
     """Convert UEC FOOD dataset to YOLO format.
 
@@ -107,6 +157,7 @@ def convert_dataset(
         val_ratio: Fraction of data for validation
         test_ratio: Fraction of data for testing
         seed: Random seed for reproducibility
+        workers: Threads used to copy and measure images concurrently
     """
     random.seed(seed)
 
@@ -167,29 +218,52 @@ def convert_dataset(
     errors = 0
 
     for split_name, split_samples in splits.items():
-        for img_path, class_id, bbox in split_samples:
+        # Copy images and get their dimensions. File I/O and PIL header
+        # parsing release the GIL, so threads overlap disk latency.
+        def copy_sample(sample):
+            img_path, class_id, bbox = sample
+            # Create unique filename
+            unique_name = f"{class_id}_{img_path.stem}"
+            dst_img = output_dir / "images" / split_name / f"{unique_name}.jpg"
             try:
-                # Get image dimensions
-                with Image.open(img_path) as img:
-                    img_width, img_height = img.size
-
-                # Convert bbox to YOLO format (0-indexed class)
-                yolo_class = class_id - 1  # UEC uses 1-indexed, YOLO uses 0-indexed
-                x_center, y_center, width, height = convert_to_yolo_format(
-                    bbox, img_width, img_height
-                )
-
-                # Skip invalid boxes
-                if width <= 0 or height <= 0:
+                size = copy_and_measure(img_path, dst_img)
+            except Exception as e:
+                dst_img.unlink(missing_ok=True)
+                return sample, None, e
+            return (img_path, class_id, bbox, unique_name, dst_img), size, None
+
+        measured = []
+        sizes = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for sample, size, error in pool.map(copy_sample, split_samples):
+                if error is not None:
+                    print(f"Error processing {sample[0]}: {error}")
                     errors += 1
                     continue
+                measured.append(sample)
+                sizes.append(size)
+
+        if not measured:
+            continue
+
+        # Convert all bboxes in the split to YOLO format in one pass
+        yolo_boxes = convert_to_yolo_format_batch(
+            [sample[2] for sample in measured], sizes
+        )
 
-                # Create unique filename
-                unique_name = f"{class_id}_{img_path.stem}"
+        for sample, yolo_box in zip(measured, yolo_boxes.tolist()):
+            img_path, class_id, _, unique_name, dst_img = sample
+            x_center, y_center, width, height = yolo_box
+
+            # Skip invalid boxes (drop the image copied above)
+            if width <= 0 or height <= 0:
+                dst_img.unlink(missing_ok=True)
+                errors += 1
+                continue
 
-                # Copy image
-                dst_img = output_dir / "images" / split_name / f"{unique_name}.jpg"
-                shutil.copy2(img_path, dst_img)
+            try:
+                # YOLO uses 0-indexed classes, UEC uses 1-indexed
+                yolo_class = class_id - 1
 
                 # Write label file
                 dst_label = output_dir / "labels" / split_name / f"{unique_name}.txt"
@@ -204,7 +278,10 @@ def convert_dataset(
 
     print(f"Processed {processed} images, {errors} errors")
 
-    # Create data.yaml
+    # Create data.yaml with class names (0-indexed)
+    names_block = "\n".join(
+        f"  {class_id - 1}: {categories[class_id]}" for class_id in sorted(categories)
+    )
     yaml_content = f"""# UEC FOOD Dataset converted to YOLO format
 # Generated from {input_dir.name}
 
@@ -215,12 +292,9 @@ test: images/test
 
 nc: {num_classes}
 names:
+{names_block}
 """
 
-    # Add class names (0-indexed)
-    for class_id in sorted(categories.keys()):
-        yaml_content += f"  {class_id - 1}: {categories[class_id]}\n"
-
     yaml_path = output_dir / "data.yaml"
     with open(yaml_path, "w") as f:
         f.write(yaml_content)
@@ -266,6 +340,12 @@ def main():
         default=42,
         help="Random seed (default: 42)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=32,
+        help="Threads for copying images (default: 32)",
+    )
 
     args = parser.parse_args()
 
@@ -287,6 +367,7 @@ def main():
         val_ratio=args.val_ratio,
         test_ratio=args.test_ratio,
         seed=args.seed,
+        workers=args.workers,
     )
 
 
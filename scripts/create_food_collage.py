@@ -2,7 +2,7 @@
 """Create a beautiful food collage from UECFOOD256 images."""
 
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageOps
 
 # Selected colorful and diverse food images - Set 2
 IMAGES = [
@@ -40,36 +40,32 @@ def create_collage(
         row = i // cols
         col = i % cols
 
-        # Load and resize image
-        img = Image.open(img_path)
+        # Load one image at a time so only a single decoded cell is live
+        with Image.open(img_path) as img:
+            # Let the JPEG decoder downscale while decoding
+            img.draft("RGB", (cell_width, cell_height))
 
-        # Calculate crop to fill cell while maintaining aspect ratio
-        img_ratio = img.width / img.height
-        cell_ratio = cell_width / cell_height
-
-        if img_ratio > cell_ratio:
-            # Image is wider - crop sides
-            new_width = int(img.height * cell_ratio)
-            left = (img.width - new_width) // 2
-            img = img.crop((left, 0, left + new_width, img.height))
-        else:
-            # Image is taller - crop top/bottom
-            new_height = int(img.width / cell_ratio)
-            top = (img.height - new_height) // 2
-            img = img.crop((0, top, img.width, top + new_height))
-
-        # Resize to cell size
-        img = img.resize((cell_width, cell_height), Image.Resampling.LANCZOS)
+            # Crop to fill cell while maintaining aspect ratio, then resize
+            cell = ImageOps.fit(
+                img, (cell_width, cell_height), Image.Resampling.LANCZOS
+            )
 
         # Calculate position
         x = col * (cell_width + gap)
         y = row * (cell_height + gap)
 
         # Paste into collage
-        collage.paste(img, (x, y))
-
-    # Save collage
-    collage.save(output_path, quality=95)
+        collage.paste(cell, (x, y))
+
+    # Save collage on the fastest libjpeg path (optimize=True would
+    # shave a few KB at roughly twice the encode time)
+    collage.save(
+        output_path,
+        quality=95,
+        optimize=False,
+        progressive=False,
+        subsampling=2,
+    )
     print(f"Collage saved to: {output_path}")
     print(f"Dimensions: {total_width}x{total_height}")
     return collage
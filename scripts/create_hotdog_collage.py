@@ -2,7 +2,7 @@
 """Create an asymmetric collage of detected hot dog images."""
 
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageOps
 
 # Selected diverse hot dog images with good detection scores
 IMAGES = [
@@ -22,9 +22,6 @@ def create_asymmetric_collage(
     gap: int = 3,
 ):
     """Create a 2x2 asymmetric grid collage."""
-    # Load all images
-    images = [Image.open(p) for p in image_paths]
-
     # Calculate cell dimensions for 2x2 grid
     cell_width = (total_width - gap) // 2
     cell_height = int(cell_width * 0.75)  # 4:3 aspect ratio
@@ -41,30 +38,29 @@ def create_asymmetric_collage(
         (cell_width + gap, cell_height + gap),  # Bottom-right
     ]
 
-    for img, (x, y) in zip(images, positions):
-        # Calculate crop to fill cell while maintaining aspect ratio
-        img_ratio = img.width / img.height
-        cell_ratio = cell_width / cell_height
-
-        if img_ratio > cell_ratio:
-            # Image is wider - crop sides
-            new_width = int(img.height * cell_ratio)
-            left = (img.width - new_width) // 2
-            img = img.crop((left, 0, left + new_width, img.height))
-        else:
-            # Image is taller - crop top/bottom
-            new_height = int(img.width / cell_ratio)
-            top = (img.height - new_height) // 2
-            img = img.crop((0, top, img.width, top + new_height))
+    for img_path, (x, y) in zip(image_paths, positions):
+        # Load one image at a time so only a single decoded cell is live
+        with Image.open(img_path) as img:
+            # Let the JPEG decoder downscale while decoding
+            img.draft("RGB", (cell_width, cell_height))
 
-        # Resize to cell size
-        img = img.resize((cell_width, cell_height), Image.Resampling.LANCZOS)
+            # Crop to fill cell while maintaining aspect ratio, then resize
+            cell = ImageOps.fit(
+                img, (cell_width, cell_height), Image.Resampling.LANCZOS
+            )
 
         # Paste into collage
-        collage.paste(img, (x, y))
-
-    # Save collage
-    collage.save(output_path, quality=95)
+        collage.paste(cell, (x, y))
+
+    # Save collage on the fastest libjpeg path (optimize=True would
+    # shave a few KB at roughly twice the encode time)
+    collage.save(
+        output_path,
+        quality=95,
+        optimize=False,
+        progressive=False,
+        subsampling=2,
+    )
     print(f"Collage saved to: {output_path}")
     print(f"Dimensions: {total_width}x{total_height}")
     return collage
@@ -8,6 +8,10 @@ import argparse
 import re
 from pathlib import Path
 
+_RE_STRIP = re.compile(r"['\-]")
+_RE_SPACE = re.compile(r"\s+")
+_RE_OTHER = re.compile(r"[^a-zA-Z0-9_]")
+
 
 def load_categories(category_file: Path) -> dict[int, str]:
     """Load category mappings from category.txt."""
@@ -28,9 +32,9 @@ def load_categories(category_file: Path) -> dict[int, str]:
 def sanitize_name(name: str) -> str:
     """Convert name to filesystem-safe format."""
     # Replace spaces and special chars with underscores
-    name = re.sub(r"['\-]", "", name)  # Remove apostrophes and hyphens
-    name = re.sub(r"\s+", "_", name)   # Spaces to underscores
-    name = re.sub(r"[^a-zA-Z0-9_]", "", name)  # Remove other special chars
+    name = _RE_STRIP.sub("", name)  # Remove apostrophes and hyphens
+    name = _RE_SPACE.sub("_", name)  # Spaces to underscores
+    name = _RE_OTHER.sub("", name)  # Remove other special chars
     return name.lower()
 
 
@@ -3,15 +3,20 @@
 
 Usage:
     python scripts/test_detection.py <input_image> [output_image]
+    python scripts/test_detection.py "<glob_pattern>" [output_dir]
 
 Examples:
     python scripts/test_detection.py test.jpg
     python scripts/test_detection.py test.jpg result.jpg
     python scripts/test_detection.py test.jpg --confidence 0.3
+    python scripts/test_detection.py "samples/*.jpg" results/ --batch 16
 """
 
 import argparse
+import glob
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import cv2
@@ -19,11 +24,18 @@ import numpy as np
 from ultralytics import YOLO
 
 
+@lru_cache(maxsize=512)
+def _text_size(label: str, font_scale: float, thickness: int):
+    """Measure a label once; labels repeat heavily across boxes and frames."""
+    return cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
+
 def draw_detections(
     image: np.ndarray,
     results,
     font_scale: float = 0.6,
     thickness: int = 2,
+    copy: bool = True,
 ) -> np.ndarray:
     """Draw bounding boxes and labels on image.
 
@@ -32,11 +44,14 @@ def draw_detections(
         results: YOLO prediction results
         font_scale: Font size for labels
         thickness: Line thickness for boxes
+        copy: Draw on a copy of image. When False, image is modified
+            in place, avoiding a full-frame copy if the caller no longer
+            needs the original.
 
     Returns:
         Annotated image
     """
-    annotated = image.copy()
+    annotated = image.copy() if copy else image
 
     if results.boxes is None or len(results.boxes) == 0:
         cv2.putText(
@@ -66,9 +81,7 @@ def draw_detections(
         cv2.rectangle(annotated, (x1, y1), (x2, y2), color, thickness)
 
         label = f"{class_name}: {confidence:.2f}"
-        (label_w, label_h), baseline = cv2.getTextSize(
-            label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
-        )
+        (label_w, label_h), baseline = _text_size(label, font_scale, thickness)
 
         cv2.rectangle(
             annotated,
@@ -91,15 +104,59 @@ def draw_detections(
     return annotated
 
 
+def detect_batch(
+    model,
+    input_paths: list[Path],
+    output_dir: Path | None,
+    confidence: float,
+    size: int,
+    batch: int,
+) -> None:
+    """Run batched inference over many images and save annotated results.
+
+    Results are streamed so only one batch is held in memory, and the
+    JPEG encoding of annotated frames overlaps with inference.
+    """
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    results = model.predict(
+        [str(p) for p in input_paths],
+        conf=confidence,
+        imgsz=size,
+        batch=batch,
+        stream=True,
+        verbose=False,
+    )
+
+    total_detections = 0
+    with ThreadPoolExecutor(max_workers=4) as writer:
+        for result in results:
+            input_path = Path(result.path)
+            num_detections = len(result.boxes) if result.boxes is not None else 0
+            total_detections += num_detections
+            print(f"  {input_path.name}: {num_detections} detection(s)")
+
+            if output_dir:
+                output_path = output_dir / input_path.name
+            else:
+                output_path = input_path.parent / f"{input_path.stem}_detected{input_path.suffix}"
+
+            annotated = draw_detections(result.orig_img, result, copy=False)
+            writer.submit(cv2.imwrite, str(output_path), annotated)
+
+    print(f"Found {total_detections} detection(s) in {len(input_paths)} image(s)")
+
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Test YOLO11 NCNN model on a single image"
+        description="Test YOLO11 NCNN model on a single image or a glob of images"
     )
-    parser.add_argument("input", help="Input image path")
+    parser.add_argument("input", help="Input image path or glob pattern")
     parser.add_argument(
         "output",
         nargs="?",
-        help="Output image path (default: input_detected.jpg)",
+        help="Output image path, or directory for a glob (default: input_detected.jpg)",
     )
     parser.add_argument(
         "--model",
@@ -118,6 +175,12 @@ def main():
         default=640,
         help="Input size for inference (default: 640)",
     )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=16,
+        help="Inference batch size when input is a glob (default: 16)",
+    )
     parser.add_argument(
         "--show",
         action="store_true",
@@ -126,6 +189,29 @@ def main():
 
     args = parser.parse_args()
 
+    if glob.has_magic(args.input):
+        input_paths = sorted(Path(p) for p in glob.glob(args.input))
+        if not input_paths:
+            print(f"Error: No images match: {args.input}")
+            sys.exit(1)
+
+        print(f"Loading model from: {args.model}")
+        model = YOLO(args.model)
+
+        print(
+            f"Running inference on {len(input_paths)} images "
+            f"(confidence={args.confidence}, size={args.size}, batch={args.batch})..."
+        )
+        detect_batch(
+            model,
+            input_paths,
+            Path(args.output) if args.output else None,
+            confidence=args.confidence,
+            size=args.size,
+            batch=args.batch,
+        )
+        return
+
     input_path = Path(args.input)
     if not input_path.exists():
         print(f"Error: Input file not found: {input_path}")
@@ -165,7 +251,7 @@ def main():
             x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
             print(f"  [{i+1}] {class_name}: {confidence:.2%} @ ({x1}, {y1}, {x2}, {y2})")
 
-    annotated = draw_detections(image, result)
+    annotated = draw_detections(image, result, copy=False)
 
     cv2.imwrite(str(output_path), annotated)
     print(f"Saved result to: {output_path}")
@@ -18,9 +18,66 @@ Usage:
 """
 
 import argparse
+import os
+import time
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
+def _yolo_cls():
+    """Import ultralytics on first use so --help and arg errors stay fast."""
+    from ultralytics import YOLO
+
+    return YOLO
+
+
+def resolve_workers(workers: str | int) -> int:
+    """Resolve the data loader worker count.
+
+    "auto" scales to the CPUs available per GPU, capped at 8; more
+    workers than that tends to regress throughput through memory and
+    GIL contention rather than help.
+    """
+    if workers != "auto":
+        return int(workers)
+
+    try:
+        import torch
+
+        gpus = torch.cuda.device_count()
+    except ImportError:
+        gpus = 0
+    return min(8, max(2, (os.cpu_count() or 1) // max(1, gpus)))
+
+
+def log_throughput(model_obj, workers: int, epochs: int = 2) -> None:
+    """Report training samples/sec over the first epochs.
+
+    Args:
+        model_obj: YOLO model about to be trained
+        workers: Data loader workers in use, echoed for tuning
+        epochs: Number of leading epochs to report
+    """
+    start = {}
+
+    def on_train_epoch_start(trainer):
+        start["t"] = time.perf_counter()
+
+    def on_train_epoch_end(trainer):
+        if trainer.epoch >= epochs:
+            return
+        elapsed = time.perf_counter() - start["t"]
+        samples = len(trainer.train_loader.dataset)
+        print(
+            f"  Epoch {trainer.epoch + 1}: {samples / elapsed:.1f} samples/s "
+            f"with {workers} workers (try --workers N to compare)"
+        )
+
+    model_obj.add_callback("on_train_epoch_start", on_train_epoch_start)
+    model_obj.add_callback("on_train_epoch_end", on_train_epoch_end)
+
+
 def train(
     data: str,
     model: str = "yolo11n.pt",
@@ -29,11 +86,16 @@ def train(
     batch: int = 16,
     device: str = "0",
     patience: int = 20,
-    workers: int = 8,
+    workers: int | str = "auto",
     project: str = "runs/detect",
     name: str = "train",
     resume: str | None = None,
     pretrained: bool = True,
+    amp: bool = True,
+    tf32: bool = True,
+    pin_memory: bool = True,
+    cache: str = "ram",
+    compile: bool = False,
 ) -> None:
     """Train YOLO model on food dataset.
 
@@ -45,24 +107,53 @@ def train(
         batch: Batch size (-1 for auto)
         device: CUDA device (0, 1, cpu, or mps for Mac)
         patience: Early stopping patience
-        workers: Number of data loader workers
+        workers: Number of data loader workers, or "auto"
         project: Project directory for outputs
         name: Run name
         resume: Path to checkpoint to resume from
         pretrained: Use pretrained weights for transfer learning
+        amp: Automatic mixed precision (FP16) training
+        tf32: Allow TF32 matmul/conv on Ampere+ GPUs and let cuDNN
+            autotune conv algorithms for the fixed input size
+        pin_memory: Page-locked host buffers for faster host-to-GPU copies
+        cache: Keep decoded, resized images in "ram" or as .npy files on
+            "disk" so JPEGs are decoded once rather than every epoch,
+            or "none". Ultralytics falls back to no cache if RAM is short.
+        compile: torch.compile the model (PyTorch >= 2.1) so Inductor can
+            fuse conv/BN/SiLU. Graphs are specialized to the fixed imgsz;
+            multi-scale training would force recompiles.
     """
-    from ultralytics import YOLO
+    # Read by ultralytics.data.build at import time. Its InfiniteDataLoader
+    # already keeps worker processes alive across epochs.
+    os.environ["PIN_MEMORY"] = str(pin_memory)
+    yolo_cls = _yolo_cls()
+
+    workers = resolve_workers(workers)
+
+    if compile:
+        import torch
+
+        if tuple(int(v) for v in torch.__version__.split(".")[:2]) < (2, 1):
+            print(f"torch {torch.__version__} < 2.1, training without torch.compile")
+            compile = False
+
+    if tf32 and device not in ("cpu", "mps"):
+        import torch
+
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.backends.cudnn.benchmark = True
 
     # Load model and train
     if resume:
         # Resume from checkpoint - uses saved args.yaml automatically
         print(f"Resuming from: {resume}")
-        model_obj = YOLO(resume)
+        model_obj = yolo_cls(resume)
         results = model_obj.train(resume=True)
     else:
         # Fresh training with specified parameters
         print(f"Loading base model: {model}")
-        model_obj = YOLO(model)
+        model_obj = yolo_cls(model)
 
         print(f"\nStarting training...")
         print(f"  Dataset: {data}")
@@ -70,8 +161,14 @@ def train(
         print(f"  Image size: {imgsz}")
         print(f"  Batch size: {batch}")
         print(f"  Device: {device}")
+        print(f"  AMP: {amp}")
+        print(f"  Workers: {workers}")
+        print(f"  Image cache: {cache}")
+        print(f"  torch.compile: {compile}")
         print()
 
+        log_throughput(model_obj, workers)
+
         results = model_obj.train(
             data=data,
             epochs=epochs,
@@ -80,9 +177,13 @@ def train(
             device=device,
             patience=patience,
             workers=workers,
+            cache=False if cache == "none" else cache,
             project=project,
             name=name,
             pretrained=pretrained,
+            amp=amp,
+            # Only pass when requested; older ultralytics rejects the arg
+            **({"compile": True} if compile else {}),
             # Data augmentation (good defaults for food)
             augment=True,
             hsv_h=0.015,  # Hue augmentation
@@ -123,6 +224,7 @@ def validate(
     imgsz: int = 640,
     batch: int = 16,
     device: str = "0",
+    half: bool | None = None,
 ) -> None:
     """Validate trained model on test set.
 
@@ -132,17 +234,23 @@ def validate(
         imgsz: Input image size
         batch: Batch size
         device: CUDA device
+        half: FP16 inference (default: on for any non-CPU device, matching
+            the AMP-trained checkpoint)
     """
-    from ultralytics import YOLO
+    if half is None:
+        half = device != "cpu"
+
+    yolo_cls = _yolo_cls()
 
     print(f"Validating model: {model}")
-    model_obj = YOLO(model)
+    model_obj = yolo_cls(model)
 
     results = model_obj.val(
         data=data,
         imgsz=imgsz,
         batch=batch,
         device=device,
+        half=half,
         split="test",
     )
 
@@ -153,12 +261,43 @@ def validate(
     return results
 
 
+# Conv/BN/bias fusions; each removes a kernel launch per layer at inference
+ONNX_FUSION_PASSES = [
+    "fuse_bn_into_conv",
+    "fuse_add_bias_into_conv",
+    "fuse_matmul_add_bias_into_gemm",
+]
+
+
+def optimize_onnx(path: str | Path) -> None:
+    """Run onnxoptimizer fusion passes over an exported ONNX model in place.
+
+    Skipped with a note if onnxoptimizer is not installed.
+    """
+    try:
+        import onnx
+        import onnxoptimizer
+    except ImportError:
+        print("  onnxoptimizer not installed; skipping fusion passes")
+        return
+
+    onnx_model = onnx.load(str(path))
+    onnx_model = onnxoptimizer.optimize(onnx_model, ONNX_FUSION_PASSES)
+    onnx.save(onnx_model, str(path))
+    print(f"  Fused graph: {', '.join(ONNX_FUSION_PASSES)}")
+
+
 def export_model(
     model: str,
     format: str = "ncnn",
     imgsz: int = 640,
     half: bool = False,
     simplify: bool = True,
+    int8: bool = False,
+    calib_data: str | None = None,
+    max_map_drop: float = 0.01,
+    device: str = "0",
+    opset: int = 17,
 ) -> None:
     """Export trained model to deployment format.
 
@@ -168,25 +307,66 @@ def export_model(
         imgsz: Input image size
         half: FP16 quantization
         simplify: Simplify ONNX model
+        int8: INT8 post-training static quantization (ncnn, onnx,
+            openvino, tflite, engine). Calibrated on calib_data.
+        calib_data: data.yaml whose images are used for INT8 calibration
+            and for the post-export accuracy check
+        max_map_drop: Largest mAP50 drop tolerated for an INT8 export
+        device: Device used for the post-export accuracy check
+        opset: ONNX opset for onnx exports
+
+    Raises:
+        ValueError: If int8 is set without calibration data
+        RuntimeError: If the INT8 model loses more than max_map_drop mAP50
     """
-    from ultralytics import YOLO
+    yolo_cls = _yolo_cls()
+
+    if int8 and not calib_data:
+        raise ValueError("INT8 export requires calibration data (--calib-data)")
 
     print(f"Exporting model: {model}")
     print(f"  Format: {format}")
     print(f"  Image size: {imgsz}")
     print(f"  Half precision: {half}")
+    print(f"  INT8: {int8}")
 
-    model_obj = YOLO(model)
+    model_obj = yolo_cls(model)
+
+    export_kwargs = {}
+    if format in {"onnx", "ncnn"}:
+        # Bake in the (1, 3, imgsz, imgsz) input so the runtime can skip
+        # dynamic shape handling
+        export_kwargs.update(dynamic=False, batch=1)
+    if format == "onnx":
+        export_kwargs.update(opset=opset)
+    if int8:
+        # Ultralytics builds the calibrator (entropy for TensorRT) from data
+        export_kwargs.update(int8=True, data=calib_data)
 
     export_path = model_obj.export(
         format=format,
         imgsz=imgsz,
         half=half,
         simplify=simplify,
+        **export_kwargs,
     )
 
+    if format == "onnx":
+        optimize_onnx(export_path)
+
     print(f"\nExport complete: {export_path}")
 
+    if int8:
+        # Reject quantized models that lose too much accuracy
+        baseline = validate(model, calib_data, imgsz=imgsz, device=device)
+        quantized = validate(str(export_path), calib_data, imgsz=imgsz, device=device)
+        drop = baseline.box.map50 - quantized.box.map50
+        print(f"\nINT8 mAP50 drop: {drop:.4f} (max {max_map_drop:.4f})")
+        if drop > max_map_drop:
+            raise RuntimeError(
+                f"INT8 export lost {drop:.4f} mAP50 (> {max_map_drop:.4f}): {export_path}"
+            )
+
     return export_path
 
 
@@ -235,7 +415,42 @@ def main():
     parser.add_argument("--batch", "-b", type=int, default=16, help="Batch size")
     parser.add_argument("--device", type=str, default="0", help="Device (0, cpu, mps)")
     parser.add_argument("--patience", type=int, default=20, help="Early stopping patience")
-    parser.add_argument("--workers", type=int, default=8, help="Data loader workers")
+    parser.add_argument(
+        "--workers",
+        type=str,
+        default="auto",
+        help="Data loader workers, or 'auto' to scale to CPUs per GPU (default: auto)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        choices=["ram", "disk", "none"],
+        default="ram",
+        help="Cache decoded images in ram or on disk (default: ram)",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="torch.compile the model for faster training (PyTorch >= 2.1)",
+    )
+    parser.add_argument(
+        "--pin-memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Pin host memory for data loading (default: on)",
+    )
+    parser.add_argument(
+        "--amp",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Mixed precision (FP16) training (default: on)",
+    )
+    parser.add_argument(
+        "--tf32",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="TF32 matmul/conv and cuDNN autotuning on CUDA (default: on)",
+    )
 
     # Output
     parser.add_argument("--project", type=str, default="runs/detect", help="Project dir")
@@ -249,12 +464,25 @@ def main():
         help="Export format (ncnn, onnx, openvino, tflite)",
     )
     parser.add_argument("--half", action="store_true", help="FP16 export")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset (default: 17)")
+    parser.add_argument("--int8", action="store_true", help="INT8 quantized export")
+    parser.add_argument(
+        "--calib-data",
+        type=str,
+        default=None,
+        help="data.yaml for INT8 calibration (default: --data)",
+    )
+    parser.add_argument(
+        "--max-map-drop",
+        type=float,
+        default=0.01,
+        help="Max mAP50 drop allowed for INT8 export (default: 0.01)",
+    )
 
     args = parser.parse_args()
 
     # Change to script directory for relative paths
     script_dir = Path(__file__).parent
-    import os
     os.chdir(script_dir)
 
     if args.export:
@@ -264,6 +492,11 @@ def main():
             format=args.format,
             imgsz=args.imgsz,
             half=args.half,
+            int8=args.int8,
+            calib_data=args.calib_data or args.data,
+            max_map_drop=args.max_map_drop,
+            device=args.device,
+            opset=args.opset,
         )
     elif args.validate:
         # Validation mode
@@ -288,6 +521,11 @@ def main():
             project=args.project,
             name=args.name,
             resume=args.resume,
+            amp=args.amp,
+            tf32=args.tf32,
+            pin_memory=args.pin_memory,
+            cache=args.cache,
+            compile=args.compile,
         )
 
 
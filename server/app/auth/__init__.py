@@ -1,5 +1,10 @@
 """Authentication module."""
 
-from app.auth.token import hash_token, optional_auth, verify_token
+from app.auth.token import (
+    hash_token,
+    invalidate_token_cache,
+    optional_auth,
+    verify_token,
+)
 
-__all__ = ["hash_token", "optional_auth", "verify_token"]
+__all__ = ["hash_token", "invalidate_token_cache", "optional_auth", "verify_token"]
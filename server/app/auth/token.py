@@ -1,16 +1,133 @@
 """Bearer token authentication."""
 
 import hashlib
+import hmac
+import time
+from collections import OrderedDict
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.auth.bloom import BloomFilter
 from app.services.firestore import FirestoreClient, get_firestore_client
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
 
+# Verified tokens: (company, token_hash) -> (expires_at, auth dict).
+# Saves a Firestore scan of every machine on each authenticated request.
+TOKEN_CACHE_TTL = 300.0
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+
+# Per-company Bloom filters of known key hashes: company -> (loaded_at,
+# filter or None if the company has no keys, whether it still has legacy
+# machines). Unknown tokens are rejected without a Firestore read; a miss
+# reloads the filter at most once per refresh interval so keys created
+# elsewhere (e.g. scripts/generate_token.py) are picked up. The company
+# name comes from the client, so only the most recently used companies
+# are kept.
+TOKEN_FILTER_REFRESH = 60.0
+TOKEN_FILTER_MAX_COMPANIES = 256
+_token_filters: OrderedDict[str, tuple[float, BloomFilter | None, bool]] = OrderedDict()
+
+
+def invalidate_token_cache(company: str | None = None) -> None:
+    """Drop cached token verifications.
+
+    Call after machine API keys change so revoked tokens stop working
+    before their cache entry expires.
+
+    Args:
+        company: Only drop entries for this company (default: all)
+    """
+    if company is None:
+        _token_cache.clear()
+        _token_filters.clear()
+        return
+    for key in [k for k in _token_cache if k[0] == company]:
+        del _token_cache[key]
+    _token_filters.pop(company, None)
+
+
+def _cache_auth(cache_key: tuple[str, str], auth: dict) -> None:
+    """Remember a successful verification until the TTL expires."""
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        _token_cache.clear()
+    _token_cache[cache_key] = (time.monotonic() + TOKEN_CACHE_TTL, auth)
+
+
+def _has_legacy_machines(company: str) -> bool:
+    """Whether a company may have machines without an api_keys entry.
+
+    True until a filter load has scanned the machines and found none.
+    """
+    entry = _token_filters.get(company)
+    return entry is None or entry[2]
+
+
+async def _load_token_filter(
+    db: FirestoreClient, company: str, scan_machines: bool
+) -> tuple[BloomFilter | None, bool]:
+    """Build a Bloom filter of every key hash stored for a company.
+
+    Reads the api_keys collection. Machines are only scanned while the
+    company may still have legacy machines, whose key hash is only in the
+    machine config; new machines always get an api_keys entry (keys added
+    by hand need one too, see scripts/generate_token.py).
+
+    Returns:
+        The filter (None if the company has no keys) and whether legacy
+        machines were found
+    """
+    company_ref = db.db.collection("companies").document(company)
+    key_hashes = {doc.id async for doc in company_ref.collection("api_keys").stream()}
+
+    legacy_hashes = set()
+    if scan_machines:
+        async for machine in company_ref.collection("machines").stream():
+            stored_hash = (machine.to_dict() or {}).get("config", {}).get("api_key_hash")
+            if stored_hash and stored_hash not in key_hashes:
+                legacy_hashes.add(stored_hash)
+
+    if not key_hashes and not legacy_hashes:
+        return None, False
+    bloom = BloomFilter()
+    for key_hash in key_hashes | legacy_hashes:
+        bloom.add(key_hash)
+    return bloom, bool(legacy_hashes)
+
+
+async def _may_be_known(db: FirestoreClient, company: str, token_hash: str) -> bool:
+    """Check a key hash against the company's Bloom filter.
+
+    False means the key (or the company) is definitely unknown as of the
+    last load.
+    """
+    now = time.monotonic()
+    entry = _token_filters.get(company)
+    if entry is not None:
+        _token_filters.move_to_end(company)
+        loaded_at, bloom, _ = entry
+        if bloom is not None and token_hash in bloom:
+            return True
+        if now - loaded_at < TOKEN_FILTER_REFRESH:
+            return False
+
+    bloom, has_legacy = await _load_token_filter(
+        db, company, scan_machines=_has_legacy_machines(company)
+    )
+    _token_filters[company] = (now, bloom, has_legacy)
+    _token_filters.move_to_end(company)
+    if len(_token_filters) > TOKEN_FILTER_MAX_COMPANIES:
+        _token_filters.popitem(last=False)
+    return bloom is not None and token_hash in bloom
+
+
+# Copying a pristine hasher skips the constructor's name lookup and setup
+_sha256_copy = hashlib.sha256().copy
+
 
 def hash_token(token: str) -> str:
     """Hash a token for secure storage comparison.
@@ -21,7 +138,9 @@ def hash_token(token: str) -> str:
     Returns:
         SHA-256 hash of the token
     """
-    return hashlib.sha256(token.encode()).hexdigest()
+    h = _sha256_copy()
+    h.update(token.encode())
+    return h.hexdigest()
 
 
 async def verify_token(
@@ -44,23 +163,55 @@ async def verify_token(
     """
     token = credentials.credentials
     token_hash = hash_token(token)
+    cache_key = (company, token_hash)
 
-    # Get all machines for company and check token
-    machines_ref = (
-        db.db.collection("companies").document(company).collection("machines")
-    )
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        expires_at, auth = cached
+        if expires_at > time.monotonic():
+            return auth
+        _token_cache.pop(cache_key, None)
+
+    # Reject unknown keys without touching Firestore
+    try:
+        known = await _may_be_known(db, company, token_hash)
+    except Exception:
+        known = False
+    if not known:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
     try:
-        machines = machines_ref.stream()
-        async for machine in machines:
-            machine_data = machine.to_dict()
-            stored_hash = machine_data.get("config", {}).get("api_key_hash")
-            if stored_hash and stored_hash == token_hash:
-                return {
-                    "company": company,
-                    "machine_id": machine.id,
-                    "machine_name": machine_data.get("name"),
-                }
+        # Indexed lookup by key hash
+        api_key = await db.get_api_key(company, token_hash)
+        if api_key:
+            auth = {
+                "company": company,
+                "machine_id": api_key["machine_id"],
+                "machine_name": api_key.get("machine_name"),
+            }
+            _cache_auth(cache_key, auth)
+            return auth
+
+        # Machines created before api_keys existed only carry the hash in
+        # their config, so those are matched by scanning the machines
+        if _has_legacy_machines(company):
+            machines_ref = (
+                db.db.collection("companies").document(company).collection("machines")
+            )
+            async for machine in machines_ref.stream():
+                machine_data = machine.to_dict()
+                stored_hash = machine_data.get("config", {}).get("api_key_hash")
+                if stored_hash and hmac.compare_digest(stored_hash, token_hash):
+                    auth = {
+                        "company": company,
+                        "machine_id": machine.id,
+                        "machine_name": machine_data.get("name"),
+                    }
+                    _cache_auth(cache_key, auth)
+                    return auth
     except Exception:
         pass
 
@@ -1,5 +1,6 @@
 """Application configuration using Pydantic settings."""
 
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -36,8 +37,20 @@ class Settings(BaseSettings):
     device_id: str = "foodinsight-001"
     device_name: str = "FoodInsight Device"
 
+    # Mock router: JSON Lines file for received events (empty = memory only)
+    mock_events_path: str = ""
+
     # Legacy (can be removed once Firestore migration complete)
     google_cloud_project: str = ""
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings, reading .env only once.
+
+    Usable as a FastAPI dependency so tests can override it.
+    """
+    return Settings()
+
+
+settings = get_settings()
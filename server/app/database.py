@@ -2,8 +2,9 @@
 
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine, event, text
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.schema import CreateTable
 
 from app.config import settings
 
@@ -19,8 +20,28 @@ engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # Required for FastAPI
     echo=settings.database_echo,  # Log SQL queries in dev
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection for concurrent reads and writes.
+
+    WAL lets event inserts proceed alongside dashboard reads, and
+    synchronous=NORMAL is durable in WAL mode without an fsync per commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -43,6 +64,49 @@ def get_db():
         db.close()
 
 
+# Indexes dropped from the models that older databases may still carry
+_OBSOLETE_INDEXES = ("ix_events_id", "ix_audit_log_id")
+
+
+def _missing_server_defaults(conn, table) -> bool:
+    """Check whether a table lacks a server default its model declares."""
+    defaults = {
+        row.name: row.dflt_value
+        for row in conn.execute(text(f"PRAGMA table_info({table.name})"))
+    }
+    return any(
+        column.server_default is not None and not defaults.get(column.name)
+        for column in table.columns
+    )
+
+
+def _rebuild_table(conn, table) -> None:
+    """Recreate a table from its model, keeping its rows.
+
+    SQLite's ALTER TABLE cannot change a column definition, so this
+    creates the new table, copies the rows across, drops the old table
+    (with its indexes and triggers) and renames the new one into place.
+    Indexes are recreated by init_db().
+    """
+    existing = {
+        row.name for row in conn.execute(text(f"PRAGMA table_info({table.name})"))
+    }
+    columns = ", ".join(c.name for c in table.columns if c.name in existing)
+    staging = table.to_metadata(MetaData(), name=f"{table.name}_rebuild")
+
+    # Left behind if an earlier rebuild failed part way
+    conn.execute(text(f"DROP TABLE IF EXISTS {staging.name}"))
+    conn.execute(CreateTable(staging))
+    conn.execute(
+        text(
+            f"INSERT INTO {staging.name} ({columns}) "
+            f"SELECT {columns} FROM {table.name}"
+        )
+    )
+    conn.execute(text(f"DROP TABLE {table.name}"))
+    conn.execute(text(f"ALTER TABLE {staging.name} RENAME TO {table.name}"))
+
+
 def init_db():
     """Initialize database tables.
 
@@ -51,3 +115,40 @@ def init_db():
     from app.db import models  # noqa: F401 - Import to register models
 
     Base.metadata.create_all(bind=engine)
+
+    # create_all cannot add a server default to an existing column, so
+    # older tables are rebuilt from the model (this also drops the
+    # timestamp triggers earlier versions used in place of the default)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if _missing_server_defaults(conn, table):
+                _rebuild_table(conn, table)
+
+    # create_all skips existing tables, so add indexes introduced since
+    # the database was first created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        for name in _OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+        # Refresh planner statistics so SQLite can pick between the
+        # (item_name, timestamp) and (event_type, timestamp) indexes
+        conn.execute(text("PRAGMA optimize"))
+
+    # Enum columns used to store member names; rewrite them as codes
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for column in table.columns:
+                if not isinstance(column.type, models.SmallIntEnum):
+                    continue
+                for member, code in column.type.codes.items():
+                    conn.execute(
+                        text(
+                            f"UPDATE {table.name} SET {column.name} = :code "
+                            f"WHERE {column.name} = :name"
+                        ),
+                        {"code": code, "name": member.name},
+                    )
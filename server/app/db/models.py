@@ -11,20 +11,24 @@ Database schema for local SQLite storage:
 
 from datetime import datetime
 from enum import Enum as PyEnum
+from operator import attrgetter
 
 from sqlalchemy import (
     JSON,
     Boolean,
     Column,
     DateTime,
-    Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 
 from app.database import Base
 
@@ -60,6 +64,56 @@ class AlertType(str, PyEnum):
     SYSTEM_OFFLINE = "SYSTEM_OFFLINE"
 
 
+# ----- Column Types -----
+
+
+class SmallIntEnum(TypeDecorator):
+    """Store a Python enum as a small integer code.
+
+    Rows and index entries hold a 1-2 byte integer instead of the member
+    name. Codes follow declaration order starting at 1, so new members
+    must only be appended. Rows written before the switch still hold the
+    member name as text; those are decoded too and rewritten by init_db().
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[PyEnum]):
+        super().__init__()
+        self.enum_class = enum_class
+        self.codes = {member: code for code, member in enumerate(enum_class, start=1)}
+        self._members = {code: member for member, code in self.codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.codes[self.enum_class(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str) and not value.isdigit():
+            return self.enum_class[value]  # Legacy name-encoded row
+        return self._members[int(value)]
+
+
+def _row_dict(fields: tuple[str, ...], values: tuple) -> dict:
+    """Build a to_dict() result from one attrgetter call's values.
+
+    Enums become their values, as the hand-written to_dict() methods do.
+    """
+    return {
+        field: value.value if isinstance(value, PyEnum) else value
+        for field, value in zip(fields, values)
+    }
+
+
+# UTC "now" evaluated by SQLite, with milliseconds (CURRENT_TIMESTAMP only
+# has whole seconds). Used as the server default on append-only tables.
+DB_NOW = text("(strftime('%Y-%m-%d %H:%M:%f', 'now'))")
+
+
 # ----- ORM Models -----
 
 
@@ -91,7 +145,7 @@ class InventoryItem(Base):
             "count": self.count,
             "max_capacity": self.max_capacity,
             "confidence": self.confidence,
-            "last_updated": self.last_updated.isoformat() if self.last_updated else None,
+            "last_updated": self.last_updated,
         }
 
 
@@ -103,30 +157,43 @@ class DetectionEvent(Base):
     """
 
     __tablename__ = "events"
-
-    id = Column(Integer, primary_key=True, index=True)
-    event_type = Column(Enum(EventType), nullable=False, index=True)
-    item_name = Column(String(100), nullable=True, index=True)  # Null for system events
+    __table_args__ = (
+        # Time-range queries filtered by item or type seek straight to the
+        # range instead of scanning and sorting
+        Index("ix_events_item_ts", "item_name", "timestamp"),
+        Index("ix_events_type_ts", "event_type", "timestamp"),
+    )
+    # Fetch the server-side timestamp via INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
+    # INTEGER PRIMARY KEY is the rowid; a separate index only slows inserts
+    id = Column(Integer, primary_key=True)
+    event_type = Column(SmallIntEnum(EventType), nullable=False)
+    item_name = Column(String(100), nullable=True)  # Null for system events
     count_before = Column(Integer, nullable=True)
     count_after = Column(Integer, nullable=True)
     confidence = Column(Float, nullable=True)
     details = Column(JSON, nullable=True)  # Additional event metadata
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, server_default=DB_NOW, index=True)
 
     def __repr__(self):
         return f"<DetectionEvent(type={self.event_type}, item={self.item_name})>"
 
+    _FIELDS = (
+        "id",
+        "event_type",
+        "item_name",
+        "count_before",
+        "count_after",
+        "confidence",
+        "details",
+        "timestamp",
+    )
+    _values = attrgetter(*_FIELDS)
+
     def to_dict(self):
-        return {
-            "id": self.id,
-            "event_type": self.event_type.value if self.event_type else None,
-            "item_name": self.item_name,
-            "count_before": self.count_before,
-            "count_after": self.count_after,
-            "confidence": self.confidence,
-            "details": self.details,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-        }
+        # Event lists can be long; fetch all attributes in one C-level call
+        return _row_dict(self._FIELDS, self._values(self))
 
 
 class Config(Base):
@@ -155,7 +222,7 @@ class Config(Base):
             "key": self.key,
             "value": self.value,
             "description": self.description,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "updated_at": self.updated_at,
         }
 
 
@@ -173,7 +240,7 @@ class AdminUser(Base):
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.VIEWER, nullable=False)
+    role = Column(SmallIntEnum(UserRole), default=UserRole.VIEWER, nullable=False)
     display_name = Column(String(100), nullable=True)
     email = Column(String(255), nullable=True)
     is_active = Column(Boolean, default=True)
@@ -195,8 +262,8 @@ class AdminUser(Base):
             "display_name": self.display_name,
             "email": self.email,
             "is_active": self.is_active,
-            "last_login": self.last_login.isoformat() if self.last_login else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "last_login": self.last_login,
+            "created_at": self.created_at,
         }
         if include_sensitive:
             data["password_hash"] = self.password_hash
@@ -217,7 +284,7 @@ class AlertRule(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
-    alert_type = Column(Enum(AlertType), nullable=False)
+    alert_type = Column(SmallIntEnum(AlertType), nullable=False)
     item_name = Column(String(100), nullable=True)  # Null for global rules
     threshold = Column(Integer, nullable=True)  # e.g., low stock threshold
     is_enabled = Column(Boolean, default=True)
@@ -241,7 +308,7 @@ class AlertRule(Base):
             "notify_email": self.notify_email,
             "notify_webhook": self.notify_webhook,
             "webhook_url": self.webhook_url,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
 
 
@@ -256,15 +323,22 @@ class AuditLog(Base):
     """
 
     __tablename__ = "audit_log"
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index("ix_audit_action_ts", "action", "timestamp"),
+        Index("ix_audit_username_ts", "username", "timestamp"),
+    )
+    # Fetch the server-side timestamp via INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
+    # INTEGER PRIMARY KEY is the rowid; a separate index only slows inserts
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("admin_users.id"), nullable=True)
     username = Column(String(50), nullable=False)  # Denormalized for easy lookup
-    action = Column(String(100), nullable=False, index=True)  # e.g., 'config.updated'
+    action = Column(String(100), nullable=False)  # e.g., 'config.updated'
     resource = Column(String(100), nullable=True)  # e.g., 'detection_threshold'
     details = Column(JSON, nullable=True)  # e.g., {old: 5, new: 3}
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, server_default=DB_NOW, index=True)
 
     # Relationship to user
     user = relationship("AdminUser", back_populates="audit_logs")
@@ -272,17 +346,20 @@ class AuditLog(Base):
     def __repr__(self):
         return f"<AuditLog(user={self.username}, action={self.action})>"
 
+    _FIELDS = (
+        "id",
+        "user_id",
+        "username",
+        "action",
+        "resource",
+        "details",
+        "ip_address",
+        "timestamp",
+    )
+    _values = attrgetter(*_FIELDS)
+
     def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "username": self.username,
-            "action": self.action,
-            "resource": self.resource,
-            "details": self.details,
-            "ip_address": self.ip_address,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-        }
+        return _row_dict(self._FIELDS, self._values(self))
 
 
 # ----- Default Configuration Values -----
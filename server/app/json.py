@@ -0,0 +1,48 @@
+"""Shared orjson encoding for API responses.
+
+All timestamps stored by the API are UTC, so naive datetimes are tagged
+as such and emitted with a ``Z`` suffix. datetime, date, Enum, UUID and
+numpy values are encoded natively by orjson; the Python ``default``
+fallback only sees the rare types orjson does not handle itself.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+_OPTIONS = (
+    orjson.OPT_NAIVE_UTC
+    | orjson.OPT_UTC_Z
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY
+)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any, option: int = 0) -> bytes:
+    """Encode obj to JSON bytes.
+
+    Args:
+        obj: Value to encode
+        option: Extra orjson options (e.g. orjson.OPT_INDENT_2)
+    """
+    return orjson.dumps(obj, default=_default, option=_OPTIONS | option)
+
+
+class ORJSONResponse(Response):
+    """JSON response encoded with dumps()."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,19 +1,22 @@
 """FoodInsight API - FastAPI entry point."""
 
-import json
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, Response
 
 from app import __version__
 from app.config import settings
 from app.database import init_db, SessionLocal
+from app.json import ORJSONResponse, dumps
+from app.responses import with_etag
 from app.routers import admin, health, inventory
+from app.services.batch_writer import audit_writer, event_writer
 from app.services.sqlite import SQLiteService
 
 logger = logging.getLogger(__name__)
@@ -36,10 +39,15 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
+    await event_writer.start()
+    await audit_writer.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await event_writer.stop()
+    await audit_writer.stop()
 
 
 app = FastAPI(
@@ -47,6 +55,8 @@ app = FastAPI(
     description="Smart snack inventory monitoring API - Local SQLite Edition",
     version=__version__,
     lifespan=lifespan,
+    # to_dict() rows carry raw datetimes; orjson serializes them natively
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration
@@ -64,6 +74,11 @@ app.include_router(inventory.router)
 app.include_router(admin.router)
 
 
+# Serialized schema by format ("json", "yaml"); the schema only changes
+# when the app is rebuilt, so each format is encoded once per process
+_openapi_cache: dict[str, bytes] = {}
+
+
 def custom_openapi():
     """Generate custom OpenAPI schema with enhanced metadata."""
     if app.openapi_schema:
@@ -116,40 +131,57 @@ Admin endpoints require HTTP Basic authentication:
         "url": "https://opensource.org/licenses/MIT"
     }
     app.openapi_schema = openapi_schema
+    _openapi_cache["json"] = dumps(openapi_schema)
     return app.openapi_schema
 
 
 app.openapi = custom_openapi
 
+# FastAPI registers its own /openapi.json route at construction, which
+# would shadow the cached handler below
+app.router.routes = [
+    route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+]
+
 
 @app.get("/openapi.json", include_in_schema=False)
-async def get_openapi_json():
+async def get_openapi_json(request: Request):
     """Export OpenAPI schema as JSON."""
-    return JSONResponse(content=app.openapi())
+    app.openapi()
+    return with_etag(
+        request,
+        Response(content=_openapi_cache["json"], media_type="application/json"),
+    )
 
 
 @app.get("/openapi.yaml", include_in_schema=False)
-async def get_openapi_yaml():
+async def get_openapi_yaml(request: Request):
     """Export OpenAPI schema as YAML."""
-    try:
-        import yaml
-        from fastapi.responses import Response
-        schema = app.openapi()
-        yaml_content = yaml.dump(schema, default_flow_style=False, sort_keys=False, allow_unicode=True)
-        return Response(content=yaml_content, media_type="application/x-yaml")
-    except ImportError:
-        # Fallback to JSON if PyYAML not installed
-        return JSONResponse(
-            content=app.openapi(),
-            media_type="application/json"
-        )
+    if "yaml" not in _openapi_cache:
+        try:
+            import yaml
+        except ImportError:
+            # Fallback to JSON if PyYAML not installed
+            return await get_openapi_json(request)
+        # LibYAML's C emitter when PyYAML was built with it
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        _openapi_cache["yaml"] = yaml.dump(
+            app.openapi(),
+            Dumper=dumper,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True,
+        ).encode()
+    return with_etag(
+        request,
+        Response(content=_openapi_cache["yaml"], media_type="application/x-yaml"),
+    )
 
 
 @app.post("/openapi/export", include_in_schema=False)
-async def export_openapi_schema():
+def export_openapi_schema():
     """Export OpenAPI schema to file in the server directory."""
     schema = app.openapi()
     output_path = Path(__file__).parent.parent / "openapi.json"
-    with open(output_path, "w") as f:
-        json.dump(schema, f, indent=2)
+    output_path.write_bytes(dumps(schema, option=orjson.OPT_INDENT_2))
     return {"message": f"Schema exported to {output_path}", "path": str(output_path)}
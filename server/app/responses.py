@@ -0,0 +1,79 @@
+"""HTTP response helpers for cached and streamed responses."""
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.json import dumps
+
+# Bytes buffered before each chunk is sent; keeps per-send overhead
+# (and the threadpool hop for sync iterators) off every row
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match already names etag."""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    )
+
+
+def with_etag(
+    request: Request,
+    response: Response,
+    max_age: int = 5,
+    private: bool = False,
+) -> Response:
+    """Add a weak ETag and Cache-Control to a rendered response.
+
+    The ETag is a hash of the response body. If the client's
+    If-None-Match already names it, an empty 304 is returned instead so
+    pollers skip the download.
+
+    Args:
+        request: Incoming request
+        response: Response with its body already rendered
+        max_age: Seconds clients may reuse the response without revalidating
+        private: Mark the response as per-user (authenticated endpoints)
+    """
+    etag = f'W/"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"{'private' if private else 'public'}, max-age={max_age}",
+    }
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
+
+
+def stream_json_list(key: str, rows: Iterable[Any]) -> StreamingResponse:
+    """Stream ``{key: [rows...], "count": n}`` without building the list.
+
+    Args:
+        key: Name of the list field
+        rows: Iterable of JSON-serializable rows, consumed lazily
+    """
+
+    def body() -> Iterator[bytes]:
+        buffer = bytearray(b"{" + dumps(key) + b":[")
+        count = 0
+        for row in rows:
+            if count:
+                buffer += b","
+            buffer += dumps(row)
+            count += 1
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b'],"count":%d}' % count
+        yield bytes(buffer)
+
+    return StreamingResponse(body(), media_type="application/json")
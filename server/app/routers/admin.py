@@ -4,23 +4,66 @@ Protected endpoints for device administration via the admin portal.
 Requires HTTP Basic authentication with role-based access control.
 """
 
+import hashlib
+import os
+import platform
+import secrets
+import time
 from datetime import date, datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 
 from app.config import settings
-from app.db.models import UserRole
-from app.services.sqlite import SQLiteService, get_sqlite_service
+from app.db.models import EventType, UserRole
+from app.json import ORJSONResponse
+from app.responses import stream_json_list, with_etag
+from app.services.batch_writer import (
+    AuditWriter,
+    EventWriter,
+    get_audit_writer,
+    get_event_writer,
+)
+from app.services.sqlite import (
+    SQLiteService,
+    get_sqlite_service,
+    stream_with_session,
+)
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    default_response_class=ORJSONResponse,
+)
+
+# Endpoints returning model rows build ORJSONResponse directly so FastAPI
+# skips the jsonable_encoder pass over them.
 
-router = APIRouter(prefix="/admin", tags=["admin"])
 security = HTTPBasic()
 
 
 # ----- Authentication -----
 
+# Recent successful logins: (username, password digest) -> (expires_at,
+# user). The admin UI polls with Basic auth, and each verify_user() call
+# is a query plus a last_login commit. Digests are keyed per process so
+# cached entries can't be matched against offline password guesses.
+AUTH_CACHE_TTL = 30.0
+AUTH_CACHE_MAX_SIZE = 1024
+_AUTH_CACHE_KEY = secrets.token_bytes(32)
+_auth_cache: dict[tuple[str, bytes], tuple[float, dict]] = {}
+
+
+def _invalidate_auth_cache(username: str) -> None:
+    """Drop cached logins for a user whose account changed."""
+    # Snapshot the keys; worker threads may add logins while we scan
+    for key in list(_auth_cache):
+        if key[0] == username:
+            _auth_cache.pop(key, None)
+
 
 def get_current_user(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
@@ -30,6 +73,18 @@ def get_current_user(
 
     Returns user dict if valid, raises 401 otherwise.
     """
+    digest = hashlib.blake2b(
+        credentials.password.encode(), digest_size=16, key=_AUTH_CACHE_KEY
+    ).digest()
+    cache_key = (credentials.username, digest)
+
+    cached = _auth_cache.get(cache_key)
+    if cached is not None:
+        expires_at, user = cached
+        if expires_at > time.monotonic():
+            return user
+        _auth_cache.pop(cache_key, None)
+
     user = service.verify_user(credentials.username, credentials.password)
     if not user:
         raise HTTPException(
@@ -37,17 +92,23 @@ def get_current_user(
             detail="Invalid credentials",
             headers={"WWW-Authenticate": "Basic"},
         )
+
+    if len(_auth_cache) >= AUTH_CACHE_MAX_SIZE:
+        _auth_cache.clear()
+    _auth_cache[cache_key] = (time.monotonic() + AUTH_CACHE_TTL, user)
     return user
 
 
 def require_role(*allowed_roles: str):
     """Dependency factory for role-based access control."""
+    allowed = frozenset(allowed_roles)
+    detail = f"Requires one of roles: {', '.join(allowed_roles)}"
 
     def check_role(user: Annotated[dict, Depends(get_current_user)]) -> dict:
-        if user["role"] not in allowed_roles:
+        if user["role"] not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Requires one of roles: {', '.join(allowed_roles)}",
+                detail=detail,
             )
         return user
 
@@ -93,6 +154,10 @@ class AlertRuleCreate(BaseModel):
 
 # ----- Device Status Endpoints -----
 
+# Fixed for the life of the process
+_PLATFORM_SYSTEM = platform.system()
+_PY_VERSION = platform.python_version()
+
 
 @router.get("/status")
 def get_device_status(
@@ -100,21 +165,20 @@ def get_device_status(
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """Get current device status."""
-    import os
-    import platform
-
     # Get system info
     try:
         load_avg = os.getloadavg()
     except (OSError, AttributeError):
         load_avg = (0, 0, 0)
 
+    device_name = service.get_config("device.name", cached=True)
+    location = service.get_config("device.location", cached=True)
     return {
         "device_id": settings.device_id,
-        "device_name": service.get_config("device.name") or settings.device_name,
-        "location": service.get_config("device.location") or "Unknown",
-        "platform": platform.system(),
-        "python_version": platform.python_version(),
+        "device_name": device_name or settings.device_name,
+        "location": location or "Unknown",
+        "platform": _PLATFORM_SYSTEM,
+        "python_version": _PY_VERSION,
         "load_average": load_avg,
         "environment": settings.environment,
     }
@@ -122,11 +186,13 @@ def get_device_status(
 
 @router.get("/config")
 def get_config(
+    request: Request,
     user: Annotated[dict, Depends(require_viewer)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """Get all device configuration."""
-    return service.get_all_config()
+    response = ORJSONResponse(service.get_all_config(cached=True))
+    return with_etag(request, response, private=True)
 
 
 @router.put("/config")
@@ -135,6 +201,7 @@ def update_config(
     request: Request,
     user: Annotated[dict, Depends(require_admin)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Update a configuration value."""
     old_value = service.get_config(data.key)
@@ -146,7 +213,7 @@ def update_config(
     )
 
     # Audit log
-    service.log_audit(
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="config.updated",
@@ -155,7 +222,7 @@ def update_config(
         ip_address=request.client.host if request.client else None,
     )
 
-    return result
+    return ORJSONResponse(result)
 
 
 # ----- Detection Control Endpoints -----
@@ -182,12 +249,13 @@ def get_detection_status(
 def start_detection(
     request: Request,
     user: Annotated[dict, Depends(require_operator)],
-    service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    events: Annotated[EventWriter, Depends(get_event_writer)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Start the detection pipeline."""
     # TODO: Integrate with actual detection service
-    service.log_event("DETECTION_STARTED", details={"started_by": user["username"]})
-    service.log_audit(
+    events.append("DETECTION_STARTED", details={"started_by": user["username"]})
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="detection.started",
@@ -200,12 +268,13 @@ def start_detection(
 def stop_detection(
     request: Request,
     user: Annotated[dict, Depends(require_operator)],
-    service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    events: Annotated[EventWriter, Depends(get_event_writer)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Stop the detection pipeline."""
     # TODO: Integrate with actual detection service
-    service.log_event("DETECTION_STOPPED", details={"stopped_by": user["username"]})
-    service.log_audit(
+    events.append("DETECTION_STOPPED", details={"stopped_by": user["username"]})
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="detection.stopped",
@@ -216,6 +285,9 @@ def stop_detection(
 
 # ----- User Management Endpoints -----
 
+_ROLE_VALUES = frozenset(r.value for r in UserRole)
+_ROLE_DETAIL = f"Invalid role. Must be one of: {[r.value for r in UserRole]}"
+
 
 @router.get("/users")
 def list_users(
@@ -223,7 +295,7 @@ def list_users(
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """List all admin users."""
-    return {"users": service.list_users()}
+    return ORJSONResponse({"users": service.list_users()})
 
 
 @router.post("/users")
@@ -232,34 +304,32 @@ def create_user(
     request: Request,
     user: Annotated[dict, Depends(require_admin)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Create a new admin user."""
-    # Check if username exists
-    existing = service.get_user(data.username)
-    if existing:
+    # Validate role
+    if data.role not in _ROLE_VALUES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already exists",
+            detail=_ROLE_DETAIL,
         )
 
-    # Validate role
+    # The UNIQUE constraint on username rejects duplicates
     try:
-        UserRole(data.role)
-    except ValueError:
+        new_user = service.create_user(
+            username=data.username,
+            password=data.password,
+            role=data.role,
+            display_name=data.display_name,
+            email=data.email,
+        )
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role. Must be one of: {[r.value for r in UserRole]}",
+            detail="Username already exists",
         )
 
-    new_user = service.create_user(
-        username=data.username,
-        password=data.password,
-        role=data.role,
-        display_name=data.display_name,
-        email=data.email,
-    )
-
-    service.log_audit(
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="user.created",
@@ -268,7 +338,7 @@ def create_user(
         ip_address=request.client.host if request.client else None,
     )
 
-    return new_user
+    return ORJSONResponse(new_user)
 
 
 @router.delete("/users/{user_id}")
@@ -277,6 +347,7 @@ def delete_user(
     request: Request,
     user: Annotated[dict, Depends(require_admin)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Delete an admin user."""
     # Prevent self-deletion
@@ -294,8 +365,9 @@ def delete_user(
         )
 
     service.delete_user(user_id)
+    _invalidate_auth_cache(target_user["username"])
 
-    service.log_audit(
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="user.deleted",
@@ -315,7 +387,7 @@ def list_alert_rules(
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """List all alert rules."""
-    return {"rules": service.get_alert_rules()}
+    return ORJSONResponse({"rules": service.get_alert_rules()})
 
 
 @router.post("/alerts")
@@ -324,6 +396,7 @@ def create_alert_rule(
     request: Request,
     user: Annotated[dict, Depends(require_admin)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Create a new alert rule."""
     rule = service.create_alert_rule(
@@ -334,7 +407,7 @@ def create_alert_rule(
         is_enabled=data.is_enabled,
     )
 
-    service.log_audit(
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="alert.created",
@@ -343,7 +416,7 @@ def create_alert_rule(
         ip_address=request.client.host if request.client else None,
     )
 
-    return rule
+    return ORJSONResponse(rule)
 
 
 # ----- Events & Audit Endpoints -----
@@ -352,35 +425,48 @@ def create_alert_rule(
 @router.get("/events")
 def get_events(
     user: Annotated[dict, Depends(require_viewer)],
-    service: Annotated[SQLiteService, Depends(get_sqlite_service)],
-    event_type: str | None = None,
+    event_type: EventType | None = None,
     item_name: str | None = None,
     limit: int = 100,
 ):
-    """Get detection events with filters."""
-    events = service.get_events(
-        event_type=event_type,
-        item_name=item_name,
-        limit=limit,
+    """Get detection events with filters.
+
+    Streamed, so large limits are not held in memory. An unknown
+    event_type is rejected with a 422 before streaming starts.
+    """
+    return stream_json_list(
+        "events",
+        stream_with_session(
+            lambda service: service.iter_events(
+                event_type=event_type,
+                item_name=item_name,
+                limit=limit,
+            )
+        ),
     )
-    return {"events": events, "count": len(events)}
 
 
 @router.get("/audit")
 def get_audit_logs(
     user: Annotated[dict, Depends(require_admin)],
-    service: Annotated[SQLiteService, Depends(get_sqlite_service)],
     username: str | None = None,
     action: str | None = None,
     limit: int = 100,
 ):
-    """Get admin audit logs."""
-    logs = service.get_audit_logs(
-        username=username,
-        action=action,
-        limit=limit,
+    """Get admin audit logs.
+
+    Streamed, so large limits are not held in memory.
+    """
+    return stream_json_list(
+        "logs",
+        stream_with_session(
+            lambda service: service.iter_audit_logs(
+                username=username,
+                action=action,
+                limit=limit,
+            )
+        ),
     )
-    return {"logs": logs, "count": len(logs)}
 
 
 # ----- System Operations -----
@@ -391,9 +477,10 @@ def reboot_device(
     request: Request,
     user: Annotated[dict, Depends(require_admin)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Schedule device reboot."""
-    service.log_audit(
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="system.reboot_requested",
@@ -408,9 +495,10 @@ def shutdown_device(
     request: Request,
     user: Annotated[dict, Depends(require_admin)],
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
+    audit: Annotated[AuditWriter, Depends(get_audit_writer)],
 ):
     """Schedule device shutdown."""
-    service.log_audit(
+    audit.append(
         username=user["username"],
         user_id=user["id"],
         action="system.shutdown_requested",
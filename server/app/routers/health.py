@@ -4,22 +4,30 @@ from datetime import datetime, timezone
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
 
 from app import __version__
 from app.config import settings
+from app.json import ORJSONResponse
 from app.services.sqlite import SQLiteService, get_sqlite_service
 
-router = APIRouter(tags=["health"])
+router = APIRouter(tags=["health"], default_response_class=ORJSONResponse)
+
+_UTC = timezone.utc
+
+# Static part of the /health body; only the timestamp changes per request
+_HEALTH_PREFIX = b'{"status":"ok","version":"' + __version__.encode() + b'","timestamp":"'
 
 
 @router.get("/health")
-def health_check():
-    """Basic health check endpoint."""
-    return {
-        "status": "ok",
-        "version": __version__,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
+async def health_check():
+    """Basic health check endpoint.
+
+    Async since it does no I/O; a sync handler would be dispatched to the
+    threadpool on every liveness probe.
+    """
+    timestamp = datetime.now(_UTC).isoformat(timespec="seconds").encode()
+    return Response(_HEALTH_PREFIX + timestamp + b'"}', media_type="application/json")
 
 
 @router.get("/ready")
@@ -46,10 +54,12 @@ def device_info(
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """Get device information for client apps."""
+    device_name = service.get_config("device.name", cached=True)
+    location = service.get_config("device.location", cached=True)
     return {
         "device_id": settings.device_id,
-        "device_name": service.get_config("device.name") or settings.device_name,
-        "location": service.get_config("device.location") or "Unknown",
+        "device_name": device_name or settings.device_name,
+        "location": location or "Unknown",
         "version": __version__,
         "api_docs": "/docs",
     }
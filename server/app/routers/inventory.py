@@ -7,13 +7,24 @@ import time
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from app.config import settings
+from app.json import ORJSONResponse
+from app.responses import with_etag
+from app.routing import ORJSONRoute, request_body_schema
+from app.services.batch_writer import EventWriter, get_event_writer
 from app.services.sqlite import SQLiteService, get_sqlite_service
 
-router = APIRouter(prefix="/inventory", tags=["inventory"])
+router = APIRouter(
+    prefix="/inventory",
+    tags=["inventory"],
+    default_response_class=ORJSONResponse,
+    route_class=ORJSONRoute,
+)
 
 
 # ----- Request/Response Models -----
@@ -33,6 +44,24 @@ class InventoryUpdateRequest(BaseModel):
     timestamp: datetime | None = None
 
 
+# msgspec mirrors of the update payload. /inventory/update is called after
+# every detection frame, and msgspec decodes and validates the body in one
+# C pass; the Pydantic models above only document it in OpenAPI.
+
+
+class _ItemUpdate(msgspec.Struct):
+    count: int
+    confidence: float = 1.0
+
+
+class _UpdateRequest(msgspec.Struct):
+    items: dict[str, _ItemUpdate]
+    timestamp: datetime | None = None
+
+
+_decode_update = msgspec.json.Decoder(_UpdateRequest).decode
+
+
 class InventoryEventCreate(BaseModel):
     """Event to log with inventory update."""
 
@@ -47,9 +76,21 @@ class InventoryEventCreate(BaseModel):
 # ----- Endpoints -----
 
 
-@router.post("/update")
-def update_inventory(
-    data: InventoryUpdateRequest,
+@router.post(
+    "/update",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": request_body_schema(InventoryUpdateRequest)
+                }
+            },
+        }
+    },
+)
+async def update_inventory(
+    request: Request,
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """Update inventory from detection pipeline.
@@ -59,15 +100,22 @@ def update_inventory(
     """
     start_time = time.time()
 
-    # Update each item
-    updated_items = []
-    for item_name, item_data in data.items.items():
-        result = service.update_inventory_item(
-            item_name=item_name,
-            count=item_data.count,
-            confidence=item_data.confidence,
+    try:
+        data = _decode_update(await request.body())
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
         )
-        updated_items.append(result)
+
+    # Update all items in one transaction
+    updated_items = await run_in_threadpool(
+        service.update_inventory_batch,
+        {
+            item_name: {"count": item.count, "confidence": item.confidence}
+            for item_name, item in data.items.items()
+        },
+    )
 
     processing_time = time.time() - start_time
 
@@ -99,26 +147,49 @@ def log_inventory_event(
     return {"status": "ok", "event_id": result["id"]}
 
 
+@router.post("/event/queued", status_code=status.HTTP_202_ACCEPTED)
+def queue_inventory_event(
+    event: InventoryEventCreate,
+    writer: Annotated[EventWriter, Depends(get_event_writer)],
+):
+    """Queue a detection event for a batched write.
+
+    Same body as POST /inventory/event, but the event is written with the
+    next batch, so no event ID is returned.
+    """
+    writer.append(
+        event_type=event.event_type,
+        item_name=event.item_name,
+        count_before=event.count_before,
+        count_after=event.count_after,
+        confidence=event.confidence,
+        details=event.details,
+    )
+    return {"status": "queued"}
+
+
 @router.get("")
 def get_inventory(
+    request: Request,
     service: Annotated[SQLiteService, Depends(get_sqlite_service)],
 ):
     """Get current inventory state.
 
     Public endpoint for client app - no authentication required.
     """
-    items = service.get_inventory()
-    location = service.get_config("device.location") or "Unknown"
-
-    return {
-        "device_id": settings.device_id,
-        "location": location,
-        "items": items,
-        "last_updated": max(
-            (item["last_updated"] for item in items if item.get("last_updated")),
-            default=None,
-        ),
-    }
+    items, last_updated = service.get_inventory_snapshot()
+    location = service.get_config("device.location", cached=True) or "Unknown"
+
+    # Returned directly so FastAPI skips jsonable_encoder over every row
+    response = ORJSONResponse(
+        {
+            "device_id": settings.device_id,
+            "location": location,
+            "items": items,
+            "last_updated": last_updated,
+        }
+    )
+    return with_etag(request, response)
 
 
 @router.get("/item/{item_name}")
@@ -149,4 +220,4 @@ def get_inventory_events(
         item_name=item_name,
         limit=limit,
     )
-    return {"events": events, "count": len(events)}
+    return ORJSONResponse({"events": events, "count": len(events)})
@@ -1,34 +1,83 @@
 """Mock endpoints for local development without Firestore."""
 
 import logging
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from itertools import islice
+from typing import Annotated
 
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 
+from app.config import settings
+from app.json import ORJSONResponse
 from app.models.inventory import InventoryUpdate
+from app.responses import etag_matches
+from app.routing import request_body_schema
+from app.services.batch_writer import JSONLWriter
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/inventory", tags=["inventory-mock"])
+# Persists events across restarts when configured; written in the background
+_event_log = (
+    JSONLWriter(settings.mock_events_path) if settings.mock_events_path else None
+)
 
-# Allowed items filter (empty list = accept all items)
+
+@asynccontextmanager
+async def lifespan(app):
+    """Run the event log writer while the app is up."""
+    if _event_log is not None:
+        await _event_log.start()
+    yield
+    if _event_log is not None:
+        await _event_log.stop()
+
+
+router = APIRouter(
+    prefix="/inventory",
+    tags=["inventory-mock"],
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Allowed items filter (empty set = accept all items)
 # These match the default COCO food classes from edge device
-ALLOWED_ITEMS: list[str] = [
+ALLOWED_ITEMS: frozenset[str] = frozenset({
     "bottle", "wine glass", "cup", "fork", "knife", "spoon", "bowl",
     "banana", "apple", "sandwich", "orange", "broccoli", "carrot",
     "hot dog", "pizza", "donut", "cake",
-]
+})
 
 # In-memory storage for mock data (starts empty, persists during server lifetime)
 _mock_inventories: dict[str, dict] = {}
 
-# Event log for debugging
-_mock_events: list[dict] = []
+# Event log for debugging, per machine and capped at MAX_EVENTS_PER_MACHINE
+MAX_EVENTS_PER_MACHINE = 10_000
+_mock_events: defaultdict[str, deque[dict]] = defaultdict(
+    lambda: deque(maxlen=MAX_EVENTS_PER_MACHINE)
+)
+
 
+# Bound once; validates the raw body in one pass with no intermediate dict
+_validate_update = TypeAdapter(InventoryUpdate).validate_json
 
-@router.post("/update")
+
+@router.post(
+    "/update",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": request_body_schema(InventoryUpdate)}
+            },
+        }
+    },
+)
 async def update_mock_inventory(
-    data: InventoryUpdate,
+    request: Request,
     authorization: str = Header(default="Bearer mock-token"),
 ):
     """Accept inventory updates from edge device (mock - no auth validation).
@@ -37,6 +86,11 @@ async def update_mock_inventory(
     but stores data in memory instead of Firestore.
     Items are filtered against ALLOWED_ITEMS if configured.
     """
+    try:
+        data = _validate_update(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
     machine_id = data.machine_id
     now = datetime.now(timezone.utc).isoformat()
 
@@ -49,20 +103,25 @@ async def update_mock_inventory(
         }
 
     # Update items (filter to allowed items if configured)
+    items = _mock_inventories[machine_id]["items"]
     items_updated = 0
+    changed = False
     for item_name, item_data in data.items.items():
         if ALLOWED_ITEMS and item_name not in ALLOWED_ITEMS:
             logger.debug(f"Skipping non-allowed item: {item_name}")
             continue
-        _mock_inventories[machine_id]["items"][item_name] = {
-            "count": item_data.count,
-            "confidence": item_data.confidence,
-        }
+        item = {"count": item_data.count, "confidence": item_data.confidence}
+        if items.get(item_name) != item:
+            items[item_name] = item
+            changed = True
         items_updated += 1
 
-    _mock_inventories[machine_id]["last_updated"] = now
+    # Only a real change moves last_updated (and so the ETag)
+    if changed:
+        _mock_inventories[machine_id]["last_updated"] = now
 
     # Log events (filter to allowed items if configured)
+    machine_events = _mock_events[machine_id]
     events_logged = 0
     for event in data.events:
         if ALLOWED_ITEMS and event.item not in ALLOWED_ITEMS:
@@ -73,7 +132,9 @@ async def update_mock_inventory(
             "timestamp": now,
             **event.model_dump(),
         }
-        _mock_events.append(event_record)
+        machine_events.append(event_record)
+        if _event_log is not None:
+            _event_log.append(event_record)
         events_logged += 1
         logger.info(f"Mock event: {event.type} - {event.item}")
 
@@ -92,16 +153,26 @@ async def update_mock_inventory(
 
 
 @router.get("/{machine_id}")
-async def get_mock_inventory(machine_id: str, company: str = "demo"):
-    """Return mock inventory for local testing."""
+async def get_mock_inventory(request: Request, machine_id: str, company: str = "demo"):
+    """Return mock inventory for local testing.
+
+    last_updated changes on every write, so it doubles as the ETag and a
+    current client gets a 304 before the payload is built.
+    """
     if machine_id in _mock_inventories:
         inventory = _mock_inventories[machine_id]
-        return {
-            "machine_id": machine_id,
-            "location": inventory["location"],
-            "items": inventory["items"],
-            "last_updated": inventory["last_updated"],
-        }
+        headers = {"ETag": f'W/"{inventory["last_updated"]}"'}
+        if etag_matches(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return ORJSONResponse(
+            {
+                "machine_id": machine_id,
+                "location": inventory["location"],
+                "items": inventory["items"],
+                "last_updated": inventory["last_updated"],
+            },
+            headers=headers,
+        )
 
     # Return default empty inventory for unknown machines
     return {
@@ -113,10 +184,19 @@ async def get_mock_inventory(machine_id: str, company: str = "demo"):
 
 
 @router.get("/{machine_id}/events")
-async def get_mock_events(machine_id: str, company: str = "demo", limit: int = 50):
-    """Return recent events for a machine (mock)."""
-    machine_events = [e for e in _mock_events if e["machine_id"] == machine_id]
-    return {"events": machine_events[-limit:]}
+async def get_mock_events(
+    machine_id: str,
+    company: str = "demo",
+    limit: Annotated[int, Query(ge=0)] = 50,
+):
+    """Return recent events for a machine (mock).
+
+    limit=0 returns every stored event.
+    """
+    # Walk back from the newest event so the cost is O(limit)
+    recent = list(islice(reversed(_mock_events.get(machine_id, ())), limit or None))
+    recent.reverse()
+    return ORJSONResponse({"events": recent})
 
 
 @router.delete("/{machine_id}")
@@ -126,8 +206,7 @@ async def reset_mock_inventory(machine_id: str):
         del _mock_inventories[machine_id]
 
     # Clear events for this machine
-    global _mock_events
-    _mock_events = [e for e in _mock_events if e["machine_id"] != machine_id]
+    _mock_events.pop(machine_id, None)
 
     logger.info(f"Mock inventory reset: {machine_id}")
     return {"status": "ok", "machine_id": machine_id, "message": "Inventory reset"}
@@ -136,9 +215,8 @@ async def reset_mock_inventory(machine_id: str):
 @router.delete("/")
 async def reset_all_mock_inventories():
     """Reset all inventories (mock - for testing)."""
-    global _mock_events
     _mock_inventories.clear()
-    _mock_events = []
+    _mock_events.clear()
 
     logger.info("All mock inventories reset")
     return {"status": "ok", "message": "All inventories reset"}
@@ -147,7 +225,9 @@ async def reset_all_mock_inventories():
 @router.get("/")
 async def list_mock_inventories():
     """List all machines with inventories (mock)."""
-    return {
-        "machines": list(_mock_inventories.keys()),
-        "allowed_items": ALLOWED_ITEMS,
-    }
+    return ORJSONResponse(
+        {
+            "machines": list(_mock_inventories.keys()),
+            "allowed_items": sorted(ALLOWED_ITEMS),
+        }
+    )
@@ -0,0 +1,57 @@
+"""Custom route classes."""
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+
+class ORJSONRoute(APIRoute):
+    """Route that parses JSON request bodies with orjson.
+
+    FastAPI reads the body through ``request.json()``, which returns the
+    already-parsed ``request._json`` when present. Malformed bodies are
+    left for FastAPI so they still produce its usual 422 response.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_handler = super().get_route_handler()
+        if self.body_field is None:
+            # No declared body (e.g. it is decoded by the endpoint itself)
+            return original_handler
+
+        async def orjson_route_handler(request: Request) -> Response:
+            if request.headers.get("content-type", "").startswith("application/json"):
+                body = await request.body()
+                if body:
+                    try:
+                        request._json = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        pass
+            return await original_handler(request)
+
+        return orjson_route_handler
+
+
+def request_body_schema(model: type[BaseModel]) -> dict:
+    """JSON schema for a model with its nested $defs inlined.
+
+    For ``openapi_extra`` on endpoints that read and validate the raw body
+    themselves, so the request schema still appears in the docs.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
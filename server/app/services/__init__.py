@@ -1,5 +1,11 @@
 """Services for FoodInsight API."""
 
+from app.services.batch_writer import (
+    AuditWriter,
+    EventWriter,
+    get_audit_writer,
+    get_event_writer,
+)
 from app.services.sqlite import SQLiteService, get_sqlite_service
 
 # Legacy Firestore (can be removed after migration)
@@ -9,6 +15,10 @@ __all__ = [
     # Primary (SQLite)
     "SQLiteService",
     "get_sqlite_service",
+    "EventWriter",
+    "get_event_writer",
+    "AuditWriter",
+    "get_audit_writer",
     # Legacy (Firestore)
     "FirestoreClient",
     "get_firestore_client",
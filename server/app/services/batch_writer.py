@@ -0,0 +1,325 @@
+"""Batched writers for append-only tables.
+
+The detection pipeline posts one event per inventory change and every
+admin mutation records an audit entry. Committing each row separately
+costs a WAL sync and a full ORM unit of work, so rows are buffered here
+and inserted in bulk by a background task. JSONLWriter applies the same
+buffering to append-only log files.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import SessionLocal
+from app.db.models import AuditLog, DetectionEvent, EventType
+from app.json import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """Buffer rows for one model and flush them with one INSERT per batch.
+
+    Rows are flushed every ``flush_interval`` seconds, or sooner once
+    ``max_batch`` rows are waiting. Until ``start()`` is called (e.g.
+    outside the app lifespan) rows are written immediately.
+
+    A batch that fails with one of ``transient_errors`` is retried up to
+    ``max_attempts`` times; any other failure, or the last attempt, drops
+    it and logs its rows at ERROR. The queue holds at most ``max_queue``
+    rows, after which the oldest are dropped with a warning.
+    """
+
+    model: type
+    transient_errors: tuple[type[Exception], ...] = (OperationalError,)
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        max_batch: int = 500,
+        flush_interval: float = 0.1,
+        max_attempts: int = 5,
+        max_queue: int = 100_000,
+    ):
+        """Initialize the writer.
+
+        Args:
+            session_factory: Factory for database sessions
+            max_batch: Rows per INSERT, and the early-flush threshold
+            flush_interval: Seconds between background flushes
+            max_attempts: Tries before a failing batch is dropped
+            max_queue: Rows buffered before the oldest are dropped
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._queue: deque[dict[str, Any]] = deque(maxlen=max_queue)
+        self._attempts = 0
+        self._dropped = 0
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+
+    @property
+    def target(self) -> str:
+        """Where rows are written, for log messages."""
+        return self.model.__tablename__
+
+    def _enqueue(self, row: dict[str, Any]) -> None:
+        """Queue a row; safe to call from FastAPI's worker threads."""
+        if len(self._queue) == self._queue.maxlen:
+            self._record_dropped(1)
+        self._queue.append(row)
+
+        if self._task is None:
+            self.flush()
+        elif len(self._queue) >= self.max_batch:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _record_dropped(self, count: int) -> None:
+        """Count rows evicted from a full queue, warning once per overflow."""
+        if not self._dropped:
+            logger.warning(
+                f"{self.target} write queue is full ({self._queue.maxlen} rows); "
+                "dropping the oldest rows"
+            )
+        self._dropped += count
+
+    def _write_failed(self, batch: list[dict[str, Any]], error: Exception) -> None:
+        """Requeue a failed batch for retry, or drop it.
+
+        Only transient errors are retried, so one bad row cannot block
+        every row queued behind it.
+        """
+        self._attempts += 1
+        if isinstance(error, self.transient_errors) and self._attempts < self.max_attempts:
+            overflow = len(self._queue) + len(batch) - self._queue.maxlen
+            if overflow > 0:
+                # extendleft() evicts from the newest end of the queue
+                self._record_dropped(overflow)
+            self._queue.extendleft(reversed(batch))
+            logger.warning(
+                f"Failed to write {len(batch)} rows to {self.target} "
+                f"(attempt {self._attempts}/{self.max_attempts}); will retry: {error}"
+            )
+            return
+
+        attempts, self._attempts = self._attempts, 0
+        logger.error(
+            f"Dropping {len(batch)} rows for {self.target} after {attempts} "
+            f"attempt(s): {batch!r}",
+            exc_info=error,
+        )
+
+    def _write_succeeded(self) -> None:
+        self._attempts = 0
+        if self._dropped:
+            logger.warning(f"Dropped {self._dropped} {self.target} rows while the queue was full")
+            self._dropped = 0
+
+    def flush(self) -> int:
+        """Write all queued rows.
+
+        A batch that fails to commit is requeued or dropped (see the class
+        docstring) before the error is raised.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        while self._queue:
+            batch = []
+            while self._queue and len(batch) < self.max_batch:
+                batch.append(self._queue.popleft())
+
+            db = self.session_factory()
+            try:
+                db.execute(insert(self.model), batch)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._write_failed(batch, e)
+                raise
+            finally:
+                db.close()
+            self._write_succeeded()
+            written += len(batch)
+        return written
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write any remaining rows."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                # Already logged and requeued or dropped
+                pass
+
+
+class EventWriter(BatchWriter):
+    """Batched writer for DetectionEvent rows."""
+
+    model = DetectionEvent
+
+    def append(
+        self,
+        event_type: EventType | str,
+        item_name: str | None = None,
+        count_before: int | None = None,
+        count_after: int | None = None,
+        confidence: float | None = None,
+        details: dict | None = None,
+    ) -> None:
+        """Queue an event for the next flush.
+
+        Raises:
+            ValueError: If event_type is not a known EventType
+        """
+        self._enqueue(
+            {
+                "event_type": EventType(event_type),
+                "item_name": item_name,
+                "count_before": count_before,
+                "count_after": count_after,
+                "confidence": confidence,
+                "details": details,
+                # Stamp now, not at flush time
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+
+
+class AuditWriter(BatchWriter):
+    """Batched writer for AuditLog rows."""
+
+    model = AuditLog
+
+    def append(
+        self,
+        username: str,
+        action: str,
+        resource: str | None = None,
+        details: dict | None = None,
+        ip_address: str | None = None,
+        user_id: int | None = None,
+    ) -> None:
+        """Queue an audit entry for the next flush.
+
+        Takes the same arguments as SQLiteService.log_audit().
+        """
+        self._enqueue(
+            {
+                "user_id": user_id,
+                "username": username,
+                "action": action,
+                "resource": resource,
+                "details": details,
+                "ip_address": ip_address,
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+
+
+class JSONLWriter(BatchWriter):
+    """Batched appender of rows to a JSON Lines file.
+
+    Each flush is one buffered append, run off the event loop by the
+    background task. Write errors (OSError) are retried like transient
+    database errors.
+    """
+
+    transient_errors = (OSError,)
+
+    def __init__(self, path: str | Path, flush_interval: float = 0.5, **kwargs):
+        """Initialize the writer.
+
+        Args:
+            path: File to append to (created with its parent directory)
+            flush_interval: Seconds between background flushes
+            **kwargs: Passed to BatchWriter
+        """
+        super().__init__(flush_interval=flush_interval, **kwargs)
+        self.path = Path(path)
+
+    @property
+    def target(self) -> str:
+        """Where rows are written, for log messages."""
+        return str(self.path)
+
+    def append(self, row: dict[str, Any]) -> None:
+        """Queue a row for the next flush."""
+        self._enqueue(row)
+
+    def flush(self) -> int:
+        """Append all queued rows to the file.
+
+        Failed rows are requeued or dropped as in BatchWriter.flush().
+
+        Returns:
+            Number of rows written
+        """
+        rows = []
+        while self._queue:
+            rows.append(self._queue.popleft())
+        if not rows:
+            return 0
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                f.write(b"".join(dumps(row) + b"\n" for row in rows))
+        except Exception as e:
+            self._write_failed(rows, e)
+            raise
+        self._write_succeeded()
+        return len(rows)
+
+
+# Shared by the app lifespan and the routers
+event_writer = EventWriter()
+audit_writer = AuditWriter()
+
+
+def get_event_writer() -> EventWriter:
+    """FastAPI dependency to get the shared event writer."""
+    return event_writer
+
+
+def get_audit_writer() -> AuditWriter:
+    """FastAPI dependency to get the shared audit writer."""
+    return audit_writer
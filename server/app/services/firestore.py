@@ -1,12 +1,16 @@
 """Firestore database service."""
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from google.cloud import firestore
 
 from app.config import settings
-from app.models.inventory import InventoryItem, MachineConfig
+
+if TYPE_CHECKING:
+    # Only used in annotations; keeps this module importable without the
+    # legacy Pydantic models (e.g. by the token auth tests)
+    from app.models.inventory import InventoryItem, MachineConfig
 
 
 class FirestoreClient:
@@ -14,6 +18,7 @@ class FirestoreClient:
 
     Data is organized by company for multi-tenant support:
     companies/{company}/machines/{machine_id}
+    companies/{company}/api_keys/{api_key_hash}
     companies/{company}/inventory/{machine_id}
     companies/{company}/events/{event_id}
     """
@@ -53,30 +58,64 @@ class FirestoreClient:
         self,
         company: str,
         machine_id: str,
-        config: MachineConfig,
+        config: "MachineConfig",
     ) -> None:
         """Create a new machine document.
 
+        Also writes an api_keys entry keyed by the key hash so token
+        verification is a single document read, and invalidates the
+        company's cached token verifications.
+
         Args:
             company: Company identifier
             machine_id: Machine identifier
             config: Machine configuration
         """
-        await (
-            self.db.collection("companies")
+        company_ref = self.db.collection("companies").document(company)
+
+        batch = self.db.batch()
+        batch.set(
+            company_ref.collection("machines").document(machine_id),
+            {
+                "name": config.name,
+                "location": config.location,
+                "status": "offline",
+                "last_seen": None,
+                "config": {"api_key_hash": config.api_key_hash},
+            },
+        )
+        batch.set(
+            company_ref.collection("api_keys").document(config.api_key_hash),
+            {"machine_id": machine_id, "machine_name": config.name},
+        )
+        await batch.commit()
+
+        # Drop cached filters so the new key is accepted immediately.
+        # Imported here because app.auth.token imports this module.
+        from app.auth.token import invalidate_token_cache
+
+        invalidate_token_cache(company)
+
+    async def get_api_key(
+        self, company: str, api_key_hash: str
+    ) -> dict[str, Any] | None:
+        """Look up the machine an API key belongs to.
+
+        Args:
+            company: Company identifier
+            api_key_hash: SHA-256 hash of the API key
+
+        Returns:
+            Dict with machine_id and machine_name, or None if not found
+        """
+        doc = (
+            await self.db.collection("companies")
             .document(company)
-            .collection("machines")
-            .document(machine_id)
-            .set(
-                {
-                    "name": config.name,
-                    "location": config.location,
-                    "status": "offline",
-                    "last_seen": None,
-                    "config": {"api_key_hash": config.api_key_hash},
-                }
-            )
+            .collection("api_keys")
+            .document(api_key_hash)
+            .get()
         )
+        return doc.to_dict() if doc.exists else None
 
     async def update_machine_status(
         self,
@@ -131,7 +170,7 @@ class FirestoreClient:
         self,
         company: str,
         machine_id: str,
-        items: dict[str, InventoryItem],
+        items: dict[str, "InventoryItem"],
     ) -> None:
         """Update inventory for a machine.
 
@@ -155,17 +194,20 @@ class FirestoreClient:
             "last_updated": now,
         }
 
-        # Update inventory document
-        await (
-            self.db.collection("companies")
-            .document(company)
-            .collection("inventory")
-            .document(machine_id)
-            .set(inventory_data, merge=True)
-        )
+        company_ref = self.db.collection("companies").document(company)
 
-        # Update machine last_seen
-        await self.update_machine_status(company, machine_id, "online")
+        # Inventory and machine last_seen in one commit round-trip
+        batch = self.db.batch()
+        batch.set(
+            company_ref.collection("inventory").document(machine_id),
+            inventory_data,
+            merge=True,
+        )
+        batch.update(
+            company_ref.collection("machines").document(machine_id),
+            {"status": "online", "last_seen": now},
+        )
+        await batch.commit()
 
     # Event operations
 
@@ -4,12 +4,18 @@ Replaces Firestore with local SQLite storage. All data is stored
 on the device with no cloud dependency.
 """
 
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
 from typing import Any
 import hashlib
+import hmac
 import secrets
+import time
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, insert, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
 
 from app.database import SessionLocal
 from app.db.models import (
@@ -26,27 +32,70 @@ from app.db.models import (
 )
 
 
+# Config values change rarely but are read on every inventory and health
+# request. The whole table is cached for CONFIG_CACHE_TTL seconds (bounding
+# staleness across worker processes); writes clear it in-process.
+CONFIG_CACHE_TTL = 5.0
+_config_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+
+
+def _cached_config(load: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    """Return the cached config dict, reloading it once it has expired."""
+    now = time.monotonic()
+    cached = _config_cache.get("all")
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    value = load()
+    _config_cache["all"] = (now + CONFIG_CACHE_TTL, value)
+    return value
+
+
+# scrypt cost parameters for new password hashes (~16 MB, tens of ms)
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+_SCRYPT_PREFIX = "scrypt$"
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=32)
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256 with salt.
+    """Hash a password with scrypt.
 
-    For production, consider using bcrypt or argon2.
-    This simple implementation works without external dependencies.
+    Stored as ``scrypt$n$r$p$salt$hash`` so the cost parameters can be
+    raised later without invalidating existing hashes.
     """
-    salt = secrets.token_hex(16)
-    hash_obj = hashlib.sha256((salt + password).encode())
-    return f"{salt}${hash_obj.hexdigest()}"
+    salt = secrets.token_bytes(16)
+    dk = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{_SCRYPT_PREFIX}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${dk.hex()}"
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its hash in constant time.
+
+    Also accepts legacy ``salt$sha256`` hashes.
+    """
     try:
+        if password_hash.startswith(_SCRYPT_PREFIX):
+            n, r, p, salt, stored = password_hash[len(_SCRYPT_PREFIX):].split("$")
+            actual = _scrypt(password, bytes.fromhex(salt), int(n), int(r), int(p))
+            return hmac.compare_digest(actual, bytes.fromhex(stored))
         salt, stored_hash = password_hash.split("$")
         hash_obj = hashlib.sha256((salt + password).encode())
-        return hash_obj.hexdigest() == stored_hash
+        return hmac.compare_digest(hash_obj.hexdigest(), stored_hash)
     except ValueError:
         return False
 
 
+def needs_rehash(password_hash: str) -> bool:
+    """Check whether a hash predates the current scrypt parameters."""
+    return not password_hash.startswith(
+        f"{_SCRYPT_PREFIX}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$"
+    )
+
+
 class SQLiteService:
     """Service layer for SQLite database operations.
 
@@ -73,6 +122,16 @@ class SQLiteService:
         items = self.db.query(InventoryItem).all()
         return [item.to_dict() for item in items]
 
+    def get_inventory_snapshot(self) -> tuple[list[dict[str, Any]], datetime | None]:
+        """Get all inventory items and the most recent update time.
+
+        Returns:
+            Tuple of (item dictionaries, latest last_updated or None)
+        """
+        items = self.get_inventory()
+        last_updated = self.db.query(func.max(InventoryItem.last_updated)).scalar()
+        return items, last_updated
+
     def get_inventory_item(self, item_name: str) -> dict[str, Any] | None:
         """Get a single inventory item by name.
 
@@ -109,56 +168,86 @@ class SQLiteService:
         Returns:
             Updated item dictionary
         """
-        item = (
-            self.db.query(InventoryItem)
-            .filter(InventoryItem.item_name == item_name)
-            .first()
-        )
-
-        if item:
-            item.count = count
-            item.confidence = confidence
-            if max_capacity is not None:
-                item.max_capacity = max_capacity
-            if display_name is not None:
-                item.display_name = display_name
-            item.last_updated = datetime.now(timezone.utc)
-        else:
-            item = InventoryItem(
-                item_name=item_name,
-                display_name=display_name or item_name.replace("_", " ").title(),
-                count=count,
-                confidence=confidence,
-                max_capacity=max_capacity,
-            )
-            self.db.add(item)
-
-        self.db.commit()
-        self.db.refresh(item)
-        return item.to_dict()
+        return self.update_inventory_batch(
+            {
+                item_name: {
+                    "count": count,
+                    "confidence": confidence,
+                    "max_capacity": max_capacity,
+                    "display_name": display_name,
+                }
+            }
+        )[0]
 
     def update_inventory_batch(
         self, items: dict[str, dict[str, Any]]
     ) -> list[dict[str, Any]]:
         """Update multiple inventory items at once.
 
+        All rows are upserted with one INSERT ... ON CONFLICT statement
+        and committed together, so an N-item update costs one commit.
+
         Args:
             items: Dict of item_name -> {count, confidence, ...}
 
         Returns:
             List of updated item dictionaries
         """
-        results = []
-        for item_name, data in items.items():
-            result = self.update_inventory_item(
-                item_name=item_name,
-                count=data.get("count", 0),
-                confidence=data.get("confidence", 1.0),
-                max_capacity=data.get("max_capacity"),
-                display_name=data.get("display_name"),
-            )
-            results.append(result)
-        return results
+        if not items:
+            return []
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "item_name": item_name,
+                "display_name": data.get("display_name")
+                or item_name.replace("_", " ").title(),
+                "count": data.get("count", 0),
+                "confidence": data.get("confidence", 1.0),
+                "max_capacity": data.get("max_capacity"),
+                "last_updated": now,
+                # Only overwrite these on existing rows when provided
+                "new_display_name": data.get("display_name"),
+                "new_max_capacity": data.get("max_capacity"),
+            }
+            for item_name, data in items.items()
+        ]
+
+        stmt = sqlite_insert(InventoryItem)
+        display_name = func.coalesce(
+            bindparam("new_display_name"), InventoryItem.display_name
+        )
+        max_capacity = func.coalesce(
+            bindparam("new_max_capacity"), InventoryItem.max_capacity
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InventoryItem.item_name],
+            set_={
+                "count": stmt.excluded.count,
+                "confidence": stmt.excluded.confidence,
+                "last_updated": stmt.excluded.last_updated,
+                "display_name": display_name,
+                "max_capacity": max_capacity,
+            },
+            # Leave unchanged rows (e.g. keepalive updates) and their
+            # last_updated untouched
+            where=or_(
+                InventoryItem.count.is_distinct_from(stmt.excluded.count),
+                InventoryItem.confidence.is_distinct_from(stmt.excluded.confidence),
+                InventoryItem.display_name.is_distinct_from(display_name),
+                InventoryItem.max_capacity.is_distinct_from(max_capacity),
+            ),
+        )
+        self.db.execute(stmt, rows)
+        self.db.commit()
+
+        updated = (
+            self.db.query(InventoryItem)
+            .filter(InventoryItem.item_name.in_(list(items)))
+            .all()
+        )
+        by_name = {item.item_name: item.to_dict() for item in updated}
+        return [by_name[item_name] for item_name in items]
 
     # ----- Event Operations -----
 
@@ -196,9 +285,42 @@ class SQLiteService:
             details=details,
         )
         self.db.add(event)
+        self.db.flush()
+        result = event.to_dict()
+        self.db.commit()
+        return result
+
+    def log_events_bulk(self, events: list[dict[str, Any]]) -> int:
+        """Log many detection events with one executemany INSERT.
+
+        Args:
+            events: Dicts with the keyword arguments of log_event()
+
+        Returns:
+            Number of events written
+
+        Raises:
+            ValueError: If an event_type is not a known EventType
+        """
+        if not events:
+            return 0
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "event_type": EventType(event["event_type"]),
+                "item_name": event.get("item_name"),
+                "count_before": event.get("count_before"),
+                "count_after": event.get("count_after"),
+                "confidence": event.get("confidence"),
+                "details": event.get("details"),
+                "timestamp": event.get("timestamp") or now,
+            }
+            for event in events
+        ]
+        self.db.execute(insert(DetectionEvent), rows)
         self.db.commit()
-        self.db.refresh(event)
-        return event.to_dict()
+        return len(rows)
 
     def get_events(
         self,
@@ -206,6 +328,7 @@ class SQLiteService:
         item_name: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        details: dict[str, Any] | None = None,
         limit: int = 100,
         offset: int = 0,
     ) -> list[dict[str, Any]]:
@@ -216,56 +339,110 @@ class SQLiteService:
             item_name: Filter by item name
             start_date: Filter events after this date
             end_date: Filter events before this date
+            details: Filter by top-level key/value pairs in event details
             limit: Maximum events to return
             offset: Offset for pagination
 
         Returns:
             List of event dictionaries
         """
+        query = self._events_query(
+            event_type, item_name, start_date, end_date, details, limit, offset
+        )
+        return [event.to_dict() for event in query.all()]
+
+    def iter_events(
+        self,
+        event_type: EventType | str | None = None,
+        item_name: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        details: dict[str, Any] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        batch_size: int = 500,
+    ) -> Iterator[dict[str, Any]]:
+        """Like get_events(), but yield rows as they are fetched.
+
+        Rows are read ``batch_size`` at a time, so large result sets are
+        never held in memory at once.
+        """
+        query = self._events_query(
+            event_type, item_name, start_date, end_date, details, limit, offset
+        )
+        for event in query.yield_per(batch_size):
+            yield event.to_dict()
+
+    def _events_query(
+        self,
+        event_type: EventType | str | None = None,
+        item_name: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        details: dict[str, Any] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Query:
+        """Build the filtered, ordered events query."""
         query = self.db.query(DetectionEvent)
 
+        # Most selective filter first; event_type binds as its SmallInteger
+        if item_name:
+            query = query.filter(DetectionEvent.item_name == item_name)
+
         if event_type:
             if isinstance(event_type, str):
                 event_type = EventType(event_type)
             query = query.filter(DetectionEvent.event_type == event_type)
 
-        if item_name:
-            query = query.filter(DetectionEvent.item_name == item_name)
-
         if start_date:
             query = query.filter(DetectionEvent.timestamp >= start_date)
 
         if end_date:
             query = query.filter(DetectionEvent.timestamp <= end_date)
 
-        events = (
+        if details:
+            # Matched by SQLite's json_extract, without decoding rows in Python
+            for key, value in details.items():
+                query = query.filter(
+                    func.json_extract(DetectionEvent.details, f"$.{key}") == value
+                )
+
+        return (
             query.order_by(DetectionEvent.timestamp.desc())
             .offset(offset)
             .limit(limit)
-            .all()
         )
-        return [event.to_dict() for event in events]
 
     # ----- Config Operations -----
 
-    def get_config(self, key: str) -> Any:
+    def get_config(self, key: str, cached: bool = False) -> Any:
         """Get a config value by key.
 
         Args:
             key: Config key
+            cached: Allow a value up to CONFIG_CACHE_TTL seconds old
 
         Returns:
             Config value or None if not found
         """
+        if cached:
+            # One cached copy of the whole table serves every key
+            return _cached_config(self.get_all_config).get(key)
         config = self.db.query(Config).filter(Config.key == key).first()
         return config.value if config else None
 
-    def get_all_config(self) -> dict[str, Any]:
+    def get_all_config(self, cached: bool = False) -> dict[str, Any]:
         """Get all config as a dictionary.
 
+        Args:
+            cached: Allow values up to CONFIG_CACHE_TTL seconds old
+
         Returns:
             Dict of key -> value
         """
+        if cached:
+            return dict(_cached_config(self.get_all_config))
         configs = self.db.query(Config).all()
         return {c.key: c.value for c in configs}
 
@@ -296,25 +473,35 @@ class SQLiteService:
             config = Config(key=key, value=value, description=description)
             self.db.add(config)
 
+        self.db.flush()
+        result = config.to_dict()
         self.db.commit()
-        self.db.refresh(config)
-        return config.to_dict()
+        _config_cache.clear()
+        return result
 
     def init_default_config(self) -> None:
         """Initialize default configuration values.
 
-        Only sets values that don't already exist.
+        Only sets values that don't already exist. All defaults go in one
+        executemany INSERT in a single transaction; existing keys are left
+        alone by ON CONFLICT DO NOTHING.
         """
-        for key, data in DEFAULT_CONFIG.items():
-            existing = self.db.query(Config).filter(Config.key == key).first()
-            if not existing:
-                config = Config(
-                    key=key,
-                    value=data["value"],
-                    description=data.get("description"),
-                )
-                self.db.add(config)
+        stmt = sqlite_insert(Config).on_conflict_do_nothing(
+            index_elements=[Config.key]
+        )
+        self.db.execute(
+            stmt,
+            [
+                {
+                    "key": key,
+                    "value": data["value"],
+                    "description": data.get("description"),
+                }
+                for key, data in DEFAULT_CONFIG.items()
+            ],
+        )
         self.db.commit()
+        _config_cache.clear()
 
     # ----- User Operations -----
 
@@ -374,6 +561,9 @@ class SQLiteService:
 
         Returns:
             Created user dictionary
+
+        Raises:
+            IntegrityError: If the username is already taken
         """
         if isinstance(role, str):
             role = UserRole(role)
@@ -388,9 +578,14 @@ class SQLiteService:
             email=email,
         )
         self.db.add(user)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            raise
+        result = user.to_dict()
         self.db.commit()
-        self.db.refresh(user)
-        return user.to_dict()
+        return result
 
     def verify_user(self, username: str, password: str) -> dict[str, Any] | None:
         """Verify user credentials.
@@ -410,10 +605,14 @@ class SQLiteService:
         )
 
         if user and verify_password(password, user.password_hash):
-            # Update last login
+            # Upgrade legacy hashes while the plain password is at hand
+            if needs_rehash(user.password_hash):
+                user.password_hash = hash_password(password)
+            # Update last login; serialise before commit expires the row
             user.last_login = datetime.now(timezone.utc)
+            result = user.to_dict()
             self.db.commit()
-            return user.to_dict()
+            return result
         return None
 
     def delete_user(self, user_id: int) -> bool:
@@ -434,8 +633,7 @@ class SQLiteService:
 
     def init_default_admin(self) -> None:
         """Create default admin user if no users exist."""
-        user_count = self.db.query(AdminUser).count()
-        if user_count == 0:
+        if not self.db.query(self.db.query(AdminUser).exists()).scalar():
             self.create_user(
                 username="admin",
                 password="admin",  # Should be changed on first login
@@ -485,9 +683,10 @@ class SQLiteService:
             is_enabled=is_enabled,
         )
         self.db.add(rule)
+        self.db.flush()
+        result = rule.to_dict()
         self.db.commit()
-        self.db.refresh(rule)
-        return rule.to_dict()
+        return result
 
     # ----- Audit Log Operations -----
 
@@ -522,9 +721,10 @@ class SQLiteService:
             ip_address=ip_address,
         )
         self.db.add(log)
+        self.db.flush()
+        result = log.to_dict()
         self.db.commit()
-        self.db.refresh(log)
-        return log.to_dict()
+        return result
 
     def get_audit_logs(
         self,
@@ -546,6 +746,32 @@ class SQLiteService:
         Returns:
             List of audit log dictionaries
         """
+        query = self._audit_logs_query(username, action, start_date, limit, offset)
+        return [log.to_dict() for log in query.all()]
+
+    def iter_audit_logs(
+        self,
+        username: str | None = None,
+        action: str | None = None,
+        start_date: datetime | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        batch_size: int = 500,
+    ) -> Iterator[dict[str, Any]]:
+        """Like get_audit_logs(), but yield rows as they are fetched."""
+        query = self._audit_logs_query(username, action, start_date, limit, offset)
+        for log in query.yield_per(batch_size):
+            yield log.to_dict()
+
+    def _audit_logs_query(
+        self,
+        username: str | None = None,
+        action: str | None = None,
+        start_date: datetime | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Query:
+        """Build the filtered, ordered audit log query."""
         query = self.db.query(AuditLog)
 
         if username:
@@ -557,13 +783,11 @@ class SQLiteService:
         if start_date:
             query = query.filter(AuditLog.timestamp >= start_date)
 
-        logs = (
+        return (
             query.order_by(AuditLog.timestamp.desc())
             .offset(offset)
             .limit(limit)
-            .all()
         )
-        return [log.to_dict() for log in logs]
 
 
 # ----- Dependency Injection -----
@@ -582,3 +806,21 @@ def get_sqlite_service() -> SQLiteService:
         yield SQLiteService(db)
     finally:
         db.close()
+
+
+def stream_with_session(
+    fetch: Callable[[SQLiteService], Iterator[Any]],
+) -> Iterator[Any]:
+    """Run a streaming query on a session that outlives the request handler.
+
+    Dependency sessions may be closed before a streamed response body is
+    sent, so the session here is opened and closed by the iterator itself.
+
+    Usage:
+        rows = stream_with_session(lambda service: service.iter_events())
+    """
+    db = SessionLocal()
+    try:
+        yield from fetch(SQLiteService(db))
+    finally:
+        db.close()
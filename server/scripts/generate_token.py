@@ -31,3 +31,6 @@ if __name__ == "__main__":
     print("Store the hash in Firestore at:")
     print("  companies/{company}/machines/{machine_id}")
     print("  → config.api_key_hash = <token_hash>")
+    print("and index it for token lookup at:")
+    print("  companies/{company}/api_keys/<token_hash>")
+    print("  → {machine_id: <machine_id>, machine_name: <name>}")
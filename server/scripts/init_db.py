@@ -14,12 +14,13 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import init_db, SessionLocal
-from app.services.sqlite import SQLiteService
-
 
 def main():
     """Initialize database with tables and default data."""
+    # Imported here so importing this module stays cheap
+    from app.database import init_db, SessionLocal
+    from app.services.sqlite import SQLiteService
+
     print("Initializing FoodInsight database...")
 
     # Create all tables
@@ -0,0 +1,23 @@
+"""Shared test fixtures."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+
+
+@pytest.fixture
+def db_engine(tmp_path, monkeypatch):
+    """Point app.database at a fresh SQLite file for one test."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    """Session factory bound to the test database, with tables created."""
+    database.init_db()
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
@@ -0,0 +1,188 @@
+"""Tests for the batched event and audit writers."""
+
+import asyncio
+import logging
+
+import pytest
+from app.db.models import AuditLog, DetectionEvent, EventType
+from app.services.batch_writer import AuditWriter, EventWriter, JSONLWriter
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+
+def count_rows(session_factory, model) -> int:
+    with session_factory() as session:
+        return session.query(model).count()
+
+
+async def wait_for_rows(session_factory, model, expected: int) -> int:
+    """Poll until a background flush has written the expected rows."""
+    for _ in range(100):
+        count = count_rows(session_factory, model)
+        if count >= expected:
+            return count
+        await asyncio.sleep(0.01)
+    return count_rows(session_factory, model)
+
+
+def test_writes_immediately_when_not_started(session_factory):
+    """Test rows are written synchronously until start() is called."""
+    writer = EventWriter(session_factory=session_factory)
+
+    writer.append(EventType.SNACK_TAKEN, item_name="chips", count_before=2, count_after=1)
+
+    with session_factory() as session:
+        event = session.query(DetectionEvent).one()
+    assert event.event_type is EventType.SNACK_TAKEN
+    assert event.item_name == "chips"
+    assert event.count_after == 1
+
+
+async def test_rows_queued_until_flush(session_factory):
+    """Test a started writer holds rows until its next flush."""
+    writer = AuditWriter(session_factory=session_factory, flush_interval=60)
+    await writer.start()
+    try:
+        writer.append(username="admin", action="config.update")
+        writer.append(username="admin", action="user.create")
+
+        assert count_rows(session_factory, AuditLog) == 0
+        assert writer.flush() == 2
+        assert count_rows(session_factory, AuditLog) == 2
+    finally:
+        await writer.stop()
+
+
+async def test_flushes_early_at_max_batch(session_factory):
+    """Test reaching max_batch wakes the background flush."""
+    writer = EventWriter(session_factory=session_factory, max_batch=3, flush_interval=60)
+    await writer.start()
+    try:
+        for _ in range(3):
+            writer.append(EventType.SNACK_ADDED, item_name="candy")
+
+        assert await wait_for_rows(session_factory, DetectionEvent, 3) == 3
+    finally:
+        await writer.stop()
+
+
+async def test_stop_drains_queue(session_factory):
+    """Test stop() writes rows queued since the last flush."""
+    writer = EventWriter(session_factory=session_factory, flush_interval=60)
+    await writer.start()
+    for _ in range(5):
+        writer.append(EventType.SNACK_TAKEN, item_name="chips")
+    assert count_rows(session_factory, DetectionEvent) == 0
+
+    await writer.stop()
+
+    assert count_rows(session_factory, DetectionEvent) == 5
+
+
+def test_flush_splits_into_max_batch_inserts(session_factory):
+    """Test a long queue is written in max_batch sized inserts."""
+    sessions = []
+
+    def counting_factory():
+        sessions.append(session_factory())
+        return sessions[-1]
+
+    writer = EventWriter(session_factory=counting_factory, max_batch=2)
+    writer._queue.extend(
+        {"event_type": EventType.SNACK_TAKEN, "item_name": f"item-{i}"} for i in range(5)
+    )
+
+    assert writer.flush() == 5
+    assert len(sessions) == 3
+    assert count_rows(session_factory, DetectionEvent) == 5
+
+
+def failing_factory(session_factory, errors: list[Exception]):
+    """Session factory whose commits raise the given errors in order."""
+
+    def factory():
+        session = session_factory()
+        if errors:
+            error = errors.pop(0)
+
+            def fail():
+                raise error
+
+            session.commit = fail
+        return session
+
+    return factory
+
+
+def test_transient_failure_keeps_rows(session_factory):
+    """Test rows from a commit that hit a locked database are retried."""
+    locked = OperationalError("INSERT", {}, Exception("database is locked"))
+    writer = AuditWriter(session_factory=failing_factory(session_factory, [locked]))
+
+    with pytest.raises(OperationalError):
+        writer.append(username="admin", action="user.delete", resource="bob")
+    assert count_rows(session_factory, AuditLog) == 0
+
+    assert writer.flush() == 1
+    with session_factory() as session:
+        entry = session.query(AuditLog).one()
+    assert (entry.action, entry.resource) == ("user.delete", "bob")
+
+
+def test_permanent_failure_drops_batch(session_factory, caplog):
+    """Test a batch failing with a non-transient error does not block later rows."""
+    bad = IntegrityError("INSERT", {}, Exception("constraint failed"))
+    writer = AuditWriter(session_factory=failing_factory(session_factory, [bad]))
+
+    with pytest.raises(IntegrityError):
+        writer.append(username="admin", action="user.delete", resource="bob")
+    assert "Dropping 1 rows for audit_log" in caplog.text
+
+    writer.append(username="admin", action="user.create", resource="eve")
+    with session_factory() as session:
+        assert [entry.resource for entry in session.query(AuditLog)] == ["eve"]
+
+
+def test_transient_failure_dropped_after_max_attempts(session_factory):
+    """Test a batch is dropped once it has failed max_attempts times."""
+    errors = [OperationalError("INSERT", {}, Exception("disk I/O error")) for _ in range(3)]
+    writer = EventWriter(session_factory=failing_factory(session_factory, errors), max_attempts=3)
+    writer._queue.append({"event_type": EventType.SNACK_TAKEN, "item_name": "chips"})
+
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            writer.flush()
+
+    assert len(writer._queue) == 0
+    assert writer.flush() == 0
+
+
+async def test_full_queue_drops_oldest_rows(session_factory, caplog):
+    """Test a full queue evicts its oldest rows and logs a warning."""
+    writer = EventWriter(session_factory=session_factory, max_queue=2, flush_interval=60)
+    await writer.start()
+    try:
+        with caplog.at_level(logging.WARNING):
+            for name in ("chips", "candy", "soda"):
+                writer.append(EventType.SNACK_ADDED, item_name=name)
+    finally:
+        await writer.stop()
+
+    assert "queue is full" in caplog.text
+    with session_factory() as session:
+        assert [event.item_name for event in session.query(DetectionEvent)] == ["candy", "soda"]
+
+
+def test_jsonl_write_error_keeps_rows(tmp_path):
+    """Test JSONL rows that fail to write are appended by the next flush."""
+    blocker = tmp_path / "logs"
+    blocker.write_text("not a directory")
+    writer = JSONLWriter(blocker / "events.jsonl")
+
+    with pytest.raises(OSError):
+        writer.append({"item": "chips"})
+
+    blocker.unlink()
+    writer.append({"item": "candy"})
+
+    lines = (blocker / "events.jsonl").read_text().splitlines()
+    assert lines == ['{"item":"chips"}', '{"item":"candy"}']
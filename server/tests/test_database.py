@@ -0,0 +1,199 @@
+"""Tests for database initialization and upgrades of older databases."""
+
+from app.db.models import (
+    AdminUser,
+    AlertRule,
+    AlertType,
+    DetectionEvent,
+    EventType,
+    SmallIntEnum,
+    UserRole,
+)
+from app.services.sqlite import SQLiteService
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app import database
+
+# Enum-bearing tables as created before enums were stored as codes
+LEGACY_SCHEMA = """
+CREATE TABLE events (
+    id INTEGER NOT NULL,
+    event_type VARCHAR(17) NOT NULL,
+    item_name VARCHAR(100),
+    count_before INTEGER,
+    count_after INTEGER,
+    confidence FLOAT,
+    details JSON,
+    timestamp DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_events_id ON events (id);
+CREATE TABLE admin_users (
+    id INTEGER NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    role VARCHAR(8) NOT NULL,
+    display_name VARCHAR(100),
+    email VARCHAR(255),
+    is_active BOOLEAN,
+    last_login DATETIME,
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE TABLE alert_rules (
+    id INTEGER NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    alert_type VARCHAR(15) NOT NULL,
+    item_name VARCHAR(100),
+    threshold INTEGER,
+    is_enabled BOOLEAN,
+    notify_email BOOLEAN,
+    notify_webhook BOOLEAN,
+    webhook_url VARCHAR(500),
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+INSERT INTO events (id, event_type, item_name, timestamp)
+VALUES (1, 'SNACK_TAKEN', 'chips', '2024-01-01 00:00:00'),
+       (2, 'SNACK_ADDED', 'chips', '2024-01-01 00:01:00');
+INSERT INTO admin_users (id, username, password_hash, role)
+VALUES (1, 'admin', 'x', 'ADMIN');
+INSERT INTO alert_rules (id, name, alert_type)
+VALUES (1, 'Chips low', 'LOW_STOCK');
+"""
+
+
+def create_legacy_db(engine) -> None:
+    raw = engine.raw_connection()
+    try:
+        raw.executescript(LEGACY_SCHEMA)
+    finally:
+        raw.close()
+
+
+def codes_of(column) -> dict:
+    assert isinstance(column.type, SmallIntEnum)
+    return column.type.codes
+
+
+def test_init_db_rewrites_legacy_enum_names(db_engine):
+    """Test enum names stored as text are rewritten as integer codes."""
+    create_legacy_db(db_engine)
+
+    database.init_db()
+
+    with db_engine.connect() as conn:
+        event_types = conn.execute(
+            text("SELECT event_type FROM events ORDER BY id")
+        ).scalars().all()
+        role = conn.execute(text("SELECT role FROM admin_users")).scalar_one()
+        alert_type = conn.execute(text("SELECT alert_type FROM alert_rules")).scalar_one()
+
+    event_codes = codes_of(DetectionEvent.__table__.c.event_type)
+    assert [int(v) for v in event_types] == [
+        event_codes[EventType.SNACK_TAKEN],
+        event_codes[EventType.SNACK_ADDED],
+    ]
+    assert int(role) == codes_of(AdminUser.__table__.c.role)[UserRole.ADMIN]
+    assert int(alert_type) == codes_of(AlertRule.__table__.c.alert_type)[
+        AlertType.LOW_STOCK
+    ]
+
+
+def test_migrated_rows_read_as_enums(db_engine):
+    """Test rewritten rows load and filter through SmallIntEnum."""
+    create_legacy_db(db_engine)
+    database.init_db()
+
+    with Session(db_engine) as session:
+        taken = (
+            session.query(DetectionEvent)
+            .filter(DetectionEvent.event_type == EventType.SNACK_TAKEN)
+            .all()
+        )
+        assert [event.id for event in taken] == [1]
+        assert taken[0].event_type is EventType.SNACK_TAKEN
+        assert session.get(AdminUser, 1).role is UserRole.ADMIN
+        assert session.get(AlertRule, 1).alert_type is AlertType.LOW_STOCK
+
+
+def test_init_db_is_idempotent(db_engine):
+    """Test running init_db again leaves migrated rows unchanged."""
+    create_legacy_db(db_engine)
+    database.init_db()
+    database.init_db()
+
+    with Session(db_engine) as session:
+        assert session.get(DetectionEvent, 2).event_type is EventType.SNACK_ADDED
+
+
+def test_legacy_table_rebuilt_with_timestamp_default(db_engine):
+    """Test legacy tables are rebuilt with the server default, keeping rows."""
+    create_legacy_db(db_engine)
+    database.init_db()
+
+    with db_engine.begin() as conn:
+        conn.execute(
+            insert(DetectionEvent.__table__).values(
+                id=3, event_type=EventType.SNACK_TAKEN, item_name="candy"
+            )
+        )
+        rows = conn.execute(text("SELECT id, timestamp FROM events ORDER BY id")).all()
+
+    assert [row.id for row in rows] == [1, 2, 3]
+    assert rows[0].timestamp == "2024-01-01 00:00:00"
+    assert rows[2].timestamp is not None
+
+
+def test_rebuild_drops_timestamp_trigger(db_engine):
+    """Test the trigger older versions added in place of the default is dropped."""
+    create_legacy_db(db_engine)
+    with db_engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TRIGGER events_timestamp_default AFTER INSERT ON events "
+                "WHEN NEW.timestamp IS NULL BEGIN "
+                "UPDATE events SET timestamp = CURRENT_TIMESTAMP "
+                "WHERE rowid = NEW.rowid; END"
+            )
+        )
+
+    database.init_db()
+
+    with db_engine.connect() as conn:
+        triggers = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        ).scalars().all()
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).scalars().all()
+
+    assert triggers == []
+    assert "ix_events_timestamp" in indexes
+
+
+def test_log_event_returns_timestamp_on_legacy_db(db_engine):
+    """Test writes to a rebuilt legacy table return the database timestamp."""
+    create_legacy_db(db_engine)
+    database.init_db()
+
+    with Session(db_engine) as session:
+        event = SQLiteService(session).log_event(EventType.SNACK_TAKEN, item_name="candy")
+
+    assert event["timestamp"] is not None
+
+
+def test_init_db_drops_obsolete_indexes(db_engine):
+    """Test indexes removed from the models are dropped from old databases."""
+    create_legacy_db(db_engine)
+    database.init_db()
+
+    with db_engine.connect() as conn:
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).scalars().all()
+
+    assert "ix_events_id" not in indexes
@@ -1,14 +1,18 @@
 """Tests for health endpoints."""
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
 from app.main import app
 
+# Share one event loop (and so one client) across the module's tests
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-@pytest.fixture
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client():
-    """Create async test client."""
+    """Create async test client, shared by all tests in the session."""
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test"
@@ -16,7 +20,6 @@ async def client():
         yield ac
 
 
-@pytest.mark.asyncio
 async def test_health_endpoint(client: AsyncClient):
     """Test /health returns ok status."""
     response = await client.get("/health")
@@ -28,7 +31,6 @@ async def test_health_endpoint(client: AsyncClient):
     assert "timestamp" in data
 
 
-@pytest.mark.asyncio
 async def test_ready_endpoint(client: AsyncClient):
     """Test /ready returns ready status."""
     response = await client.get("/ready")
@@ -38,14 +40,12 @@ async def test_ready_endpoint(client: AsyncClient):
     assert data["status"] == "ready"
 
 
-@pytest.mark.asyncio
 async def test_openapi_docs(client: AsyncClient):
     """Test OpenAPI documentation is available."""
     response = await client.get("/docs")
     assert response.status_code == 200
 
 
-@pytest.mark.asyncio
 async def test_openapi_json(client: AsyncClient):
     """Test OpenAPI JSON schema is available."""
     response = await client.get("/openapi.json")
@@ -0,0 +1,73 @@
+"""Tests for SQLiteService inventory upserts."""
+
+import pytest
+from app.services.sqlite import SQLiteService
+
+
+@pytest.fixture
+def service(session_factory):
+    """SQLiteService over the per-test database."""
+    with session_factory() as session:
+        yield SQLiteService(session)
+
+
+def test_upsert_creates_items(service: SQLiteService):
+    """Test new items are inserted with a derived display name."""
+    [item] = service.update_inventory_batch({"potato_chips": {"count": 3}})
+
+    assert item["item_name"] == "potato_chips"
+    assert item["display_name"] == "Potato Chips"
+    assert item["count"] == 3
+
+
+def test_unchanged_upsert_keeps_last_updated(service: SQLiteService):
+    """Test repeating an identical update leaves the row untouched."""
+    [first] = service.update_inventory_batch(
+        {"chips": {"count": 3, "confidence": 0.9, "max_capacity": 10}}
+    )
+    [second] = service.update_inventory_batch(
+        {"chips": {"count": 3, "confidence": 0.9}}
+    )
+
+    assert second["last_updated"] == first["last_updated"]
+    assert second["max_capacity"] == 10
+
+
+def test_changed_upsert_moves_last_updated(service: SQLiteService):
+    """Test a changed count is written with a new last_updated."""
+    [first] = service.update_inventory_batch({"chips": {"count": 3}})
+    [second] = service.update_inventory_batch({"chips": {"count": 2}})
+
+    assert second["count"] == 2
+    assert second["last_updated"] > first["last_updated"]
+
+
+def test_batch_only_touches_changed_rows(service: SQLiteService):
+    """Test a batch updates changed items and skips the rest."""
+    before = {
+        item["item_name"]: item
+        for item in service.update_inventory_batch(
+            {"chips": {"count": 3}, "candy": {"count": 5}}
+        )
+    }
+
+    after = {
+        item["item_name"]: item
+        for item in service.update_inventory_batch(
+            {"chips": {"count": 3}, "candy": {"count": 4}}
+        )
+    }
+
+    assert after["chips"]["last_updated"] == before["chips"]["last_updated"]
+    assert after["candy"]["last_updated"] > before["candy"]["last_updated"]
+    assert after["candy"]["count"] == 4
+
+
+def test_display_name_change_is_written(service: SQLiteService):
+    """Test changing only the display name counts as a change."""
+    service.update_inventory_batch({"chips": {"count": 3}})
+    [item] = service.update_inventory_batch(
+        {"chips": {"count": 3, "display_name": "Crisps"}}
+    )
+
+    assert item["display_name"] == "Crisps"
@@ -0,0 +1,240 @@
+"""Tests for bearer token verification caches."""
+
+from types import SimpleNamespace
+
+import pytest
+from app.auth import token as token_auth
+from app.auth.token import hash_token, invalidate_token_cache, verify_token
+from app.services.firestore import FirestoreClient
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+VALID_TOKEN = "sk_demo_valid"
+VALID_HASH = hash_token(VALID_TOKEN)
+
+
+class FakeDoc:
+    """Firestore document snapshot."""
+
+    def __init__(self, doc_id: str, data: dict):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self) -> dict:
+        return self._data
+
+
+class FakeCollection:
+    """Firestore collection or query over a dict of documents."""
+
+    def __init__(self, firestore: "FakeFirestore", docs: dict):
+        self.firestore = firestore
+        self.docs = docs
+
+    def document(self, doc_id: str):
+        return FakeCompany(self.firestore, self.docs.setdefault(doc_id, {}))
+
+    def limit(self, count: int) -> "FakeCollection":
+        return FakeCollection(self.firestore, dict(list(self.docs.items())[:count]))
+
+    async def get(self) -> list[FakeDoc]:
+        self.firestore.reads += 1
+        return [FakeDoc(doc_id, data) for doc_id, data in self.docs.items()]
+
+    async def stream(self):
+        self.firestore.reads += 1
+        for doc_id, data in self.docs.items():
+            yield FakeDoc(doc_id, data)
+
+
+class FakeCompany:
+    """Company document with machines and api_keys subcollections."""
+
+    def __init__(self, firestore: "FakeFirestore", data: dict):
+        self.firestore = firestore
+        self.data = data
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self.firestore, self.data.setdefault(name, {}))
+
+
+class FakeBatch:
+    """Write batch that applies its writes on commit."""
+
+    def __init__(self):
+        self.writes = []
+
+    def set(self, ref: FakeCompany, data: dict) -> None:
+        self.writes.append((ref, data))
+
+    async def commit(self) -> None:
+        for ref, data in self.writes:
+            ref.data.clear()
+            ref.data.update(data)
+
+
+class FakeFirestore:
+    """Just enough of FirestoreClient for verify_token, counting reads."""
+
+    def __init__(self, companies: dict):
+        self.companies = companies
+        self.reads = 0
+        self.db = self
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, self.companies)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch()
+
+    async def get_api_key(self, company: str, api_key_hash: str) -> dict | None:
+        self.reads += 1
+        return self.companies.get(company, {}).get("api_keys", {}).get(api_key_hash)
+
+
+def credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def clear_token_caches():
+    """Start every test with empty token caches."""
+    invalidate_token_cache()
+    yield
+    invalidate_token_cache()
+
+
+@pytest.fixture
+def firestore() -> FakeFirestore:
+    """Firestore with one company, one machine and its api_keys entry."""
+    return FakeFirestore(
+        {
+            "acme": {
+                "machines": {
+                    "m1": {"name": "Lobby", "config": {"api_key_hash": VALID_HASH}}
+                },
+                "api_keys": {VALID_HASH: {"machine_id": "m1", "machine_name": "Lobby"}},
+            }
+        }
+    )
+
+
+async def test_valid_token(firestore: FakeFirestore):
+    """Test a known token resolves to its machine."""
+    auth = await verify_token(credentials(VALID_TOKEN), "acme", firestore)
+
+    assert auth == {"company": "acme", "machine_id": "m1", "machine_name": "Lobby"}
+
+
+async def test_verified_token_is_cached(firestore: FakeFirestore):
+    """Test repeat verifications of a token skip Firestore."""
+    await verify_token(credentials(VALID_TOKEN), "acme", firestore)
+    reads = firestore.reads
+
+    await verify_token(credentials(VALID_TOKEN), "acme", firestore)
+
+    assert firestore.reads == reads
+
+
+async def test_invalidate_token_cache(firestore: FakeFirestore):
+    """Test a revoked key stops working once the cache is invalidated."""
+    await verify_token(credentials(VALID_TOKEN), "acme", firestore)
+
+    del firestore.companies["acme"]["api_keys"][VALID_HASH]
+    del firestore.companies["acme"]["machines"]["m1"]["config"]["api_key_hash"]
+    invalidate_token_cache("acme")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await verify_token(credentials(VALID_TOKEN), "acme", firestore)
+    assert exc_info.value.status_code == 401
+
+
+async def test_create_machine_invalidates_token_filter(firestore: FakeFirestore):
+    """Test a key created after the filter loaded is accepted immediately."""
+    new_token = "sk_demo_new"
+    with pytest.raises(HTTPException):
+        await verify_token(credentials(new_token), "acme", firestore)
+
+    client = FirestoreClient.__new__(FirestoreClient)
+    client.db = firestore
+    await client.create_machine(
+        "acme",
+        "m2",
+        SimpleNamespace(
+            name="Kitchen", location="2F", api_key_hash=hash_token(new_token)
+        ),
+    )
+
+    auth = await verify_token(credentials(new_token), "acme", firestore)
+    assert auth["machine_id"] == "m2"
+
+
+async def test_unknown_token_rejected_by_filter(firestore: FakeFirestore):
+    """Test an unknown token for a known company skips the key lookup."""
+    await verify_token(credentials(VALID_TOKEN), "acme", firestore)
+    reads = firestore.reads
+
+    with pytest.raises(HTTPException):
+        await verify_token(credentials("sk_demo_guess"), "acme", firestore)
+
+    assert firestore.reads == reads
+
+
+async def test_unknown_company_rejected(firestore: FakeFirestore):
+    """Test an unknown company costs two reads and keeps no filter."""
+    with pytest.raises(HTTPException):
+        await verify_token(credentials(VALID_TOKEN), "nobody", firestore)
+    assert firestore.reads == 2
+    assert token_auth._token_filters["nobody"][1] is None
+
+    with pytest.raises(HTTPException):
+        await verify_token(credentials(VALID_TOKEN), "nobody", firestore)
+    assert firestore.reads == 2
+
+
+async def test_filter_reload_skips_machines(
+    firestore: FakeFirestore, monkeypatch: pytest.MonkeyPatch
+):
+    """Test reloads read only api_keys once no legacy machines are left."""
+    monkeypatch.setattr(token_auth, "TOKEN_FILTER_REFRESH", 0.0)
+    with pytest.raises(HTTPException):
+        await verify_token(credentials("sk_demo_guess"), "acme", firestore)
+    assert firestore.reads == 2  # api_keys and machines
+
+    with pytest.raises(HTTPException):
+        await verify_token(credentials("sk_demo_guess"), "acme", firestore)
+    assert firestore.reads == 3  # api_keys only
+
+
+async def test_legacy_machine_token(
+    firestore: FakeFirestore, monkeypatch: pytest.MonkeyPatch
+):
+    """Test a machine without an api_keys entry is found by scanning machines."""
+    monkeypatch.setattr(token_auth, "TOKEN_FILTER_REFRESH", 0.0)
+    legacy_token = "sk_demo_legacy"
+    firestore.companies["acme"]["machines"]["m0"] = {
+        "name": "Basement",
+        "config": {"api_key_hash": hash_token(legacy_token)},
+    }
+
+    auth = await verify_token(credentials(legacy_token), "acme", firestore)
+    assert auth["machine_id"] == "m0"
+
+    # Later reloads keep scanning machines while legacy ones exist
+    reads = firestore.reads
+    with pytest.raises(HTTPException):
+        await verify_token(credentials("sk_demo_guess"), "acme", firestore)
+    assert firestore.reads == reads + 2
+
+
+async def test_token_filters_bounded(
+    firestore: FakeFirestore, monkeypatch: pytest.MonkeyPatch
+):
+    """Test only the most recently used companies keep a filter."""
+    monkeypatch.setattr(token_auth, "TOKEN_FILTER_MAX_COMPANIES", 2)
+
+    for company in ("acme", "bogus-1", "bogus-2"):
+        with pytest.raises(HTTPException):
+            await verify_token(credentials("sk_demo_guess"), company, firestore)
+
+    assert list(token_auth._token_filters) == ["bogus-1", "bogus-2"]
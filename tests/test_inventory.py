@@ -209,3 +209,82 @@ class TestInventoryStateManager:
         assert len(manager.current_counts) == 0
         assert len(manager.active_tracks) == 0
         assert len(manager.pending_events) == 0
+
+
+def detection(track_id: int, class_name: str) -> TrackedDetection:
+    """Build a tracked detection with a placeholder box."""
+    return TrackedDetection(
+        track_id=track_id,
+        class_id=0,
+        class_name=class_name,
+        confidence=0.9,
+        bbox=[100, 100, 200, 200],
+    )
+
+
+class TestTrackStorage:
+    """Test the parallel per-track arrays behind InventoryStateManager."""
+
+    def test_removal_keeps_other_tracks_aligned(self):
+        """Test removing a track leaves the remaining tracks correctly indexed."""
+        manager = InventoryStateManager(machine_id="test-001", debounce_frames=2)
+        manager.update([detection(1, "chips"), detection(2, "candy"), detection(3, "soda")])
+
+        # Track 2 leaves
+        for _ in range(2):
+            events = manager.update([detection(1, "chips"), detection(3, "soda")])
+        assert [(e.type, e.track_id, e.item) for e in events] == [
+            (EventType.SNACK_TAKEN, 2, "candy")
+        ]
+        assert set(manager.active_tracks) == {1, 3}
+
+        # Track 3 leaves; its class must still be soda after reindexing
+        for _ in range(2):
+            events = manager.update([detection(1, "chips")])
+        assert [(e.type, e.track_id, e.item) for e in events] == [
+            (EventType.SNACK_TAKEN, 3, "soda")
+        ]
+        assert manager.get_current_inventory() == {"chips": 1, "candy": 0, "soda": 0}
+
+    def test_simultaneous_expiry_in_first_seen_order(self):
+        """Test tracks expiring together are reported in the order first seen."""
+        manager = InventoryStateManager(machine_id="test-001", debounce_frames=1)
+        manager.update([detection(7, "chips")])
+        manager.update([detection(7, "chips"), detection(3, "chips")])
+
+        events = manager.update([])
+
+        assert [e.track_id for e in events] == [7, 3]
+        assert [(e.count_before, e.count_after) for e in events] == [(2, 1), (1, 0)]
+
+    def test_track_id_reused_after_removal(self):
+        """Test a track ID seen again after it was taken counts as a new item."""
+        manager = InventoryStateManager(machine_id="test-001", debounce_frames=1)
+        manager.update([detection(1, "chips")])
+        manager.update([])
+
+        events = manager.update([detection(1, "chips")])
+
+        assert [e.type for e in events] == [EventType.SNACK_ADDED]
+        assert manager.current_counts["chips"] == 1
+
+    def test_duplicate_track_in_frame_counted_once(self):
+        """Test a track ID repeated within one frame is one item."""
+        manager = InventoryStateManager(machine_id="test-001")
+
+        events = manager.update([detection(1, "chips"), detection(1, "chips")])
+
+        assert len(events) == 1
+        assert manager.current_counts["chips"] == 1
+
+    def test_reset_clears_track_arrays(self):
+        """Test tracking works again from scratch after reset."""
+        manager = InventoryStateManager(machine_id="test-001", debounce_frames=1)
+        manager.update([detection(1, "chips"), detection(2, "candy")])
+        manager.reset()
+
+        events = manager.update([detection(5, "soda")])
+        assert [e.track_id for e in events] == [5]
+
+        events = manager.update([])
+        assert [(e.type, e.track_id) for e in events] == [(EventType.SNACK_TAKEN, 5)]
@@ -52,6 +52,48 @@ class TestMotionDetector:
         assert result is True
         assert detector.last_motion_score > 0.02
 
+    def test_score_is_changed_pixel_fraction(self):
+        """Test the motion score is the fraction of pixels that changed."""
+        detector = MotionDetector(cooldown_frames=0)
+        detector.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+
+        # Every pixel changes
+        detector.detect(np.full((480, 640, 3), 255, dtype=np.uint8))
+        assert detector.last_motion_score == 1.0
+
+        # Left half returns to black; only blur at the edge is partial
+        frame = np.full((480, 640, 3), 255, dtype=np.uint8)
+        frame[:, :320] = 0
+        detector.detect(frame)
+        assert detector.last_motion_score == pytest.approx(0.5, abs=0.05)
+
+    def test_small_intensity_change_ignored(self):
+        """Test changes below PIXEL_DIFF_THRESHOLD do not count as motion."""
+        detector = MotionDetector(threshold=0.0, cooldown_frames=0)
+        frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+        detector.detect(frame)
+
+        # Uniform brightness shift, e.g. auto-exposure
+        shifted = frame + (MotionDetector.PIXEL_DIFF_THRESHOLD - 5)
+        result = detector.detect(shifted)
+
+        assert result is False
+        assert detector.last_motion_score == 0.0
+
+    def test_threshold_applies_to_changed_fraction(self):
+        """Test the threshold compares against the changed-pixel fraction."""
+        black = np.zeros((480, 640, 3), dtype=np.uint8)
+        half = black.copy()
+        half[:, :320] = 255
+
+        above = MotionDetector(threshold=0.6, cooldown_frames=0)
+        above.detect(black)
+        assert above.detect(half) is False
+
+        below = MotionDetector(threshold=0.4, cooldown_frames=0)
+        below.detect(black)
+        assert below.detect(half) is True
+
     def test_cooldown(self):
         """Test cooldown period after motion."""
         detector = MotionDetector(threshold=0.02, cooldown_frames=5)
@@ -57,13 +57,13 @@ class TestPrivacyPipeline:
         assert result.shape == (150, 200, 3)  # (200-50, 300-100, 3)
 
     def test_process_for_display_no_roi(self):
-        """Test display processing with no ROI returns original."""
+        """Test display processing with no ROI returns the frame itself."""
         pipeline = PrivacyPipeline()
         frame = np.zeros((480, 640, 3), dtype=np.uint8)
         frame[100:200, 100:200] = 128
 
         result = pipeline.process_for_display(frame)
-        assert np.array_equal(result, frame)
+        assert result is frame
 
     def test_process_for_display_with_roi_preserves_region(self):
         """Test that ROI region is preserved in display output."""